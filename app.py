@@ -1,38 +1,101 @@
+import copy
+
 import pandas as pd
 import streamlit as st
 
+from src import instrument
 from src import (
-    load_datasets,
+    SPEC_CACHE,
+    cached_spec,
+    delta_data,
+    home_away_data,
+    match_data,
+    points_data,
+    DatasetStore,
     chart_delta_points,
     chart_home_away_points,
     chart_match_scatter,
     chart_points_by_team,
+    chart_points_trajectory,
+    chart_swing_range,
+    swing_data,
+    trajectory_data,
 )
+from src.schema import memory_report
 from utils import (
     movement_sentence,
+    pace_sentence,
+    swing_sentence,
     match_callouts,
     team_delta,
     home_away_delta,
+    home_away_deltas,
 )
+from utils.story import DETAIL_COLUMNS, brushed_matches, load_stories, match_details, story_path
+
+
+@st.cache_resource(show_spinner=False)
+def get_store():
+    # shared by every session; swaps in a rebuilt snapshot when data/ changes
+    return DatasetStore().start()
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _load_stories(version, mtime_ns):
+    # mtime_ns only keys the cache, so a rewritten file is read again
+    return load_stories(version)
 
 
-@st.cache_data(show_spinner=False)
-def get_datasets():
-    return load_datasets()
+def get_stories(version):
+    # prebuilt by `python -m utils.story`; None means compute per rerun. A
+    # missing file is not cached, so stories built later are picked up
+    try:
+        mtime_ns = story_path(version).stat().st_mtime_ns
+    except OSError:
+        return None
+    return _load_stories(version, mtime_ns)
+
+
+def render_chart(builder, make_data, league_wide=False, **kwargs):
+    spec = cached_spec(
+        builder, make_data, datasets.version, selected_team, seasons, league_wide
+    )
+    # st.vega_lite_chart moves spec["datasets"] onto its proto in place
+    with instrument.stage(f"app.render_chart.{builder.__name__}"):
+        return st.vega_lite_chart(spec=copy.deepcopy(spec), **kwargs)
 
 
 st.set_page_config(page_title="HW4 - Premier League Story", layout="wide")
+instrument.start_rerun()
 
-datasets = get_datasets()
+store = get_store()
+snapshot = store.wait(timeout=0.5)
+if snapshot is None:
+    if store.last_error is not None:
+        # nothing to fall back on; the watcher keeps retrying meanwhile
+        st.error(f"Could not load the match data: {store.last_error!r}")
+        st.stop()
+    # cold start with nothing cached: keep the page live while it loads
+    st.info("Loading match data for the first time...")
+    store.wait(timeout=2.0)
+    st.rerun()
+if store.refreshing:
+    st.caption("Showing the last loaded data while newer match files load in the background.")
+elif store.last_error is not None:
+    st.caption(f"Showing the last loaded data; the newest match files failed to load ({store.last_error!r}).")
+datasets = snapshot.datasets
+stories = get_stories(datasets.version) or {}
 
-delta_df = datasets.delta_points.dropna(subset=["delta_points"]).copy()
-delta_df = delta_df.sort_values("delta_points", ascending=False)
+delta_df = datasets.ranked_deltas
 
 biggest_riser_row = delta_df.iloc[0]
 biggest_faller_row = delta_df.iloc[-1]
 max_riser, max_faller = str(biggest_riser_row["Team"]), str(biggest_faller_row["Team"])
 
-st.title("Who rose and who fell from 2023-24 to 2024-25?")
+seasons = datasets.compare_seasons
+prev_season, curr_season = seasons
+
+st.title(f"Who rose and who fell from {prev_season} to {curr_season}?")
 st.write(
     "Was each swing driven more by home form, away form, or both?"
 )
@@ -58,13 +121,22 @@ metric_col2.metric(
 
 st.header("1) What were the biggest swings?")
 
-delta_event = st.altair_chart(
-    chart_delta_points(delta_df, selected_team),
-    width='stretch',
-    on_select="rerun",
-    selection_mode=["delta_pick"],
-    key="delta_chart",
-)
+delta_col, swing_col = st.columns(2)
+with delta_col:
+    delta_event = render_chart(
+        chart_delta_points,
+        lambda: delta_data(delta_df, seasons),
+        league_wide=True,
+        width='stretch',
+        on_select="rerun",
+        selection_mode=["delta_pick"],
+        key="delta_chart",
+    )
+with swing_col:
+    swings = snapshot.swings
+    render_chart(
+        chart_swing_range, lambda: swing_data(swings), league_wide=True, width='stretch'
+    )
 
 st.write(
     "Here we see a roughly even distribution of teams upswings and downswings, with "
@@ -80,14 +152,27 @@ st.markdown(
 )
 
 
+story = stories.get(selected_team)
+
 st.header("2) How big was the change in points?")
-p23, p24, p_delta = team_delta(datasets.team_summary, selected_team)
+if story:
+    p23, p24, p_delta = story["points"]["prev"], story["points"]["curr"], story["points"]["delta"]
+    movement = story["movement"]
+else:
+    p23, p24, p_delta = team_delta(datasets, selected_team)
+    movement = movement_sentence(p_delta)
 st.write(
-    f"{selected_team} moved from **{p23:.0f}** points in 2023-24 to **{p24:.0f}** in 2024-25 "
-    f"(**{p_delta:+.0f}**). {movement_sentence(p_delta)}"
+    f"{selected_team} moved from **{p23:.0f}** points in {prev_season} to **{p24:.0f}** in {curr_season} "
+    f"(**{p_delta:+.0f}**). {movement}"
 )
-st.altair_chart(
-    chart_points_by_team(datasets.team_summary, selected_team),
+swing = swings.loc[swings["Team"] == selected_team]
+if not swing.empty:
+    swing = swing.iloc[0]
+    st.write(swing_sentence(selected_team, swing["xdelta"], swing["swing_pct"], markdown=True))
+render_chart(
+    chart_points_by_team,
+    lambda: points_data(datasets.team_summary, seasons),
+    league_wide=True,
     width='stretch',
 )
 
@@ -98,23 +183,76 @@ st.write(
     "This is explored further in the next section where we break down the points change by home and away games."
 )
 
+render_chart(
+    chart_points_trajectory,
+    lambda: trajectory_data(datasets.trajectory, selected_team, seasons),
+    width='stretch',
+)
+gap = datasets.trajectory.delta_trajectory(selected_team, prev_season, curr_season)
+pace = pace_sentence(selected_team, gap, prev_season, markdown=True)
+if pace is not None:
+    st.write(pace)
+
+with st.expander("League table on any date"):
+    table = datasets.league_table
+    table_season = st.selectbox(
+        "Season", table.seasons, index=len(table.seasons) - 1, key="table_season"
+    )
+    first_day, last_day = table.date_range(table_season)
+    table_date = st.slider(
+        "Date",
+        min_value=first_day.date(),
+        max_value=last_day.date(),
+        value=last_day.date(),
+        key="table_date",
+    )
+    st.dataframe(table.at(table_season, table_date), width='stretch', hide_index=True)
+
 
 st.header("3) Where did the points come from: home or away?")
-driver = home_away_delta(datasets.home_away_points, selected_team)
+if story:
+    driver = story["home_away"]
+else:
+    driver = home_away_delta(datasets, selected_team)
 st.write(
     f"For {selected_team}, home points changed by **{driver['home_change']:+.0f}** "
-    f"({driver['home_23']:.0f} to {driver['home_24']:.0f}) and away points changed by "
-    f"**{driver['away_change']:+.0f}** ({driver['away_23']:.0f} to {driver['away_24']:.0f}). "
+    f"({driver['home_prev']:.0f} to {driver['home_curr']:.0f}) and away points changed by "
+    f"**{driver['away_change']:+.0f}** ({driver['away_prev']:.0f} to {driver['away_curr']:.0f}). "
     f"Overall this swing was **{driver['driver']}**."
 )
-st.altair_chart(
-    chart_home_away_points(datasets.home_away_points, selected_team),
+render_chart(
+    chart_home_away_points,
+    lambda: home_away_data(datasets.home_away_points, seasons),
+    league_wide=True,
     width='stretch',
 )
 
+with st.expander("Against the top six, and under which referees"):
+    matchups = datasets.matchups
+    top_six = matchups.top_teams(curr_season)
+    vs_top = matchups.query(
+        ["season", "Venue"],
+        {"Team": selected_team, "Opponent": top_six, "season": seasons},
+        ["Matches", "Won", "Drawn", "Lost", "Points"],
+    )
+    st.write(f"Points against the {curr_season} top six ({', '.join(top_six)}):")
+    st.dataframe(vs_top, width='stretch', hide_index=True)
+    cards = matchups.query(
+        ["Referee"],
+        {"Team": selected_team, "season": seasons},
+        ["Matches", "Fouls", "Yellow", "Red", "Points"],
+    )
+    st.dataframe(
+        cards.sort_values(["Matches", "Yellow"], ascending=False),
+        width='stretch',
+        hide_index=True,
+    )
+
+
 st.markdown(f"**Notes on the Max Riser ({max_riser}) & Max Faller ({max_faller})**")
+league_drivers = home_away_deltas(datasets)
 for team in [str(biggest_riser_row["Team"]), str(biggest_faller_row["Team"])]:
-    p_driver = home_away_delta(datasets.home_away_points, team)
+    p_driver = league_drivers.loc[team]
     st.write(
         f"{team}: total swing **{p_driver['total_change']:+.0f}**. "
         f"Home changed **{p_driver['home_change']:+.0f}**, away changed **{p_driver['away_change']:+.0f}**. "
@@ -133,44 +271,48 @@ st.write(
     "Usage: brush big wins (high GF, low GA), tight games near the diagonal, or heavy losses (low GF, high GA)."
 )
 
-scatter_event = st.altair_chart(
-    chart_match_scatter(datasets.team_matches, selected_team),
+scatter_event = render_chart(
+    chart_match_scatter,
+    lambda: match_data(
+        datasets.team_matches,
+        selected_team,
+        datasets.team_index["team_matches"],
+        seasons,
+    ),
     width='stretch',
     on_select="rerun",
     selection_mode=["match_brush"],
     key="match_scatter",
 )
 
-gf = scatter_event.get("selection", {}).get("match_brush", {}).get("GF", [0, 20])
-ga = scatter_event.get("selection", {}).get("match_brush", {}).get("GA", [0, 20])
-gf_range = (min(float(gf[0]), float(gf[1])), max(float(gf[0]), float(gf[1])))
-ga_range = (min(float(ga[0]), float(ga[1])), max(float(ga[0]), float(ga[1])))
+brush = scatter_event.get("selection", {}).get("match_brush", {})
 
-selected_matches = datasets.team_matches.loc[datasets.team_matches["Team"] == selected_team].copy()
+if story and not brush:
+    callouts = story["callouts"]
+    details = pd.DataFrame(story["matches"], columns=DETAIL_COLUMNS)
+else:
+    gf = brush.get("GF", [0, 20])
+    ga = brush.get("GA", [0, 20])
+    gf_range = (min(float(gf[0]), float(gf[1])), max(float(gf[0]), float(gf[1])))
+    ga_range = (min(float(ga[0]), float(ga[1])), max(float(ga[0]), float(ga[1])))
 
-if gf_range and ga_range:
-    selected_matches = selected_matches.loc[
-        (selected_matches["GF"] >= gf_range[0])
-        & (selected_matches["GF"] <= gf_range[1])
-        & (selected_matches["GA"] >= ga_range[0])
-        & (selected_matches["GA"] <= ga_range[1])
-    ]
+    selected_matches = brushed_matches(
+        datasets.team_index["team_matches"].rows(selected_team), gf_range, ga_range
+    )
+    callouts = match_callouts(selected_matches, selected_team)
+    details = match_details(selected_matches)
 
 
 st.subheader("Callouts: matches that explain the swing")
-callouts = match_callouts(selected_matches, selected_team)
 if callouts:
     for line in callouts:
         st.write(f"- {line}")
 else:
     st.write("No matches are currently inside the brush. Clear the brush or select a broader region.")
 
-details_cols = ["Date", "season", "Venue", "Opponent", "GF", "GA", "Points", "Referee"]
-if selected_matches.empty:
-    st.dataframe(pd.DataFrame(columns=details_cols), width='stretch')
+if details.empty:
+    st.dataframe(pd.DataFrame(columns=DETAIL_COLUMNS), width='stretch')
 else:
-    details = selected_matches.sort_values("Date", ascending=True).head(20)[details_cols].copy()
-    details["Date"] = details["Date"].dt.strftime("%Y-%m-%d")
     st.dataframe(details, width='stretch', hide_index=True)
 
 st.header("5) Self-Exploration")
@@ -182,3 +324,16 @@ st.write(
 st.write("1. Click a team in the dropdown under the first chart.")
 st.write("2. Check whether the swing is home-driven, away-driven, or balanced.")
 st.write("3. Brush groups of matches to see which result types drove the shift.")
+
+if instrument.ENABLED:
+    stage_records = instrument.finish_rerun()
+    with st.expander("Debug: stage timings for this rerun"):
+        st.dataframe(
+            pd.DataFrame([vars(record) for record in stage_records]),
+            width='stretch',
+            hide_index=True,
+        )
+        st.write("Chart spec cache:", SPEC_CACHE.stats())
+        st.code(instrument.prometheus_text(), language="text")
+        st.write("Memory held by the loaded frames:")
+        st.dataframe(memory_report(datasets), width='stretch', hide_index=True)
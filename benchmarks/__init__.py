@@ -0,0 +1,3 @@
+"""
+Benchmarks, run without Streamlit
+"""
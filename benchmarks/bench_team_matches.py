@@ -0,0 +1,179 @@
+"""
+Load time and peak memory: stacked-array team_matches vs the old copy/rename/concat melt,
+both built from the raw concatenated CSV frames
+
+    python -m benchmarks.bench_team_matches --seasons 30 --repeat 3
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data import DATA_DIR, _prepare_matches, _team_matches
+
+HOME_COLUMNS = {
+    "HomeTeam": "Team", "AwayTeam": "Opponent", "FTHG": "GF", "FTAG": "GA",
+    "home_points": "Points", "HS": "Shots", "HST": "SOT", "HF": "Fouls",
+    "HC": "Corners", "HY": "Yellow", "HR": "Red",
+}
+AWAY_COLUMNS = {
+    "AwayTeam": "Team", "HomeTeam": "Opponent", "FTAG": "GF", "FTHG": "GA",
+    "away_points": "Points", "AS": "Shots", "AST": "SOT", "AF": "Fouls",
+    "AC": "Corners", "AY": "Yellow", "AR": "Red",
+}
+SHARED = ["match_id", "season", "Date", "Referee", "home_points", "away_points"]
+
+
+def legacy_team_matches(raw: pd.DataFrame) -> pd.DataFrame:
+    # the pre-stacking implementation: mixed-format date parsing, object
+    # columns and a string match_id
+    matches = raw.copy()
+    matches["Date"] = pd.to_datetime(matches["Date"], dayfirst=True, format="mixed")
+    matches["home_points"] = np.where(
+        matches["FTR"] == "H", 3, np.where(matches["FTR"] == "D", 1, 0)
+    )
+    matches["away_points"] = np.where(
+        matches["FTR"] == "A", 3, np.where(matches["FTR"] == "D", 1, 0)
+    )
+    matches["total_goals"] = matches["FTHG"] + matches["FTAG"]
+    matches["goal_diff"] = matches["FTHG"] - matches["FTAG"]
+    matches["match_id"] = (
+        matches["season"].astype(str)
+        + "|"
+        + matches["Date"].dt.strftime("%Y-%m-%d")
+        + "|"
+        + matches["HomeTeam"].astype(str)
+        + "|"
+        + matches["AwayTeam"].astype(str)
+    )
+    home_rows = matches[list(dict.fromkeys(SHARED + list(HOME_COLUMNS)))].copy()
+    home_rows.rename(columns=HOME_COLUMNS, inplace=True)
+    home_rows["Venue"] = "Home"
+    away_rows = matches[list(dict.fromkeys(SHARED + list(AWAY_COLUMNS)))].copy()
+    away_rows.rename(columns=AWAY_COLUMNS, inplace=True)
+    away_rows["Venue"] = "Away"
+
+    team_matches = pd.concat([home_rows, away_rows], ignore_index=True)
+    team_matches["GD"] = team_matches["GF"] - team_matches["GA"]
+    team_matches["Win"] = (team_matches["Points"] == 3).astype(int)
+    return team_matches
+
+
+def stacked_team_matches(raw: pd.DataFrame) -> pd.DataFrame:
+    return _team_matches(_prepare_matches(raw.copy()))
+
+
+IMPLS = {"legacy": legacy_team_matches, "stacked": stacked_team_matches}
+
+
+def synth_matches(seasons: int) -> pd.DataFrame:
+    # recycle the bundled seasons under new labels, one per synthetic year,
+    # exactly as read_csv returns them
+    sources = sorted(DATA_DIR.glob("PL-season-*.csv"))
+    frames = []
+    for i in range(seasons):
+        df = pd.read_csv(sources[i % len(sources)])
+        df["season"] = f"{1990 + i}-{(91 + i) % 100:02d}"
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+def time_one(impl: str, matches_path: Path, repeat: int) -> dict:
+    raw = pd.read_pickle(matches_path)
+    build = IMPLS[impl]
+
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        build(raw)
+        timings.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    team_matches = build(raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "rows": len(team_matches),
+        "best_s": min(timings),
+        "median_s": float(np.median(timings)),
+        "traced_peak_mb": peak / 2**20,
+        "result_mb": team_matches.memory_usage(deep=True).sum() / 2**20,
+    }
+
+
+def rss_one(impl: str, matches_path: Path) -> dict:
+    # a single untraced build; the caller runs this in a fresh interpreter so
+    # the high-water mark is not left over from earlier builds
+    raw = pd.read_pickle(matches_path)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    IMPLS[impl](raw)
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "peak_rss_mb": rss_after / 1024,
+        "peak_rss_growth_mb": (rss_after - rss_before) / 1024,
+    }
+
+
+def _run_fresh(*args: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_team_matches", *args],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seasons", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--impl", choices=list(IMPLS), help=argparse.SUPPRESS)
+    parser.add_argument("--rss", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--matches", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.impl:
+        if args.rss:
+            print(json.dumps(rss_one(args.impl, args.matches)))
+        else:
+            print(json.dumps(time_one(args.impl, args.matches, args.repeat)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        matches_path = Path(tmp) / "matches.pkl"
+        synth_matches(args.seasons).to_pickle(matches_path)
+
+        # timings in one interpreter per implementation, RSS in another that
+        # runs a single build
+        results = []
+        for impl in IMPLS:
+            common = ["--impl", impl, "--matches", str(matches_path)]
+            results.append({
+                "impl": impl,
+                **_run_fresh(*common, "--repeat", str(args.repeat)),
+                **_run_fresh(*common, "--rss"),
+            })
+
+    print(f"{args.seasons} seasons")
+    print(
+        f"{'impl':<8} {'rows':>8} {'best s':>8} {'traced MB':>10} "
+        f"{'RSS MB':>8} {'RSS +MB':>8} {'result MB':>10}"
+    )
+    for r in results:
+        print(
+            f"{r['impl']:<8} {r['rows']:>8} {r['best_s']:>8.4f} {r['traced_peak_mb']:>10.1f} "
+            f"{r['peak_rss_mb']:>8.1f} {r['peak_rss_growth_mb']:>8.1f} {r['result_mb']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Headless benchmark of the load -> aggregate -> chart -> callout pipeline
+
+    python -m benchmarks.pipeline --teams 20 --seasons 30 --out bench.json
+    python -m benchmarks.pipeline --seasons 30 --compare bench.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+from src import (
+    Datasets,
+    chart_delta_points,
+    chart_home_away_points,
+    chart_match_scatter,
+    chart_points_by_team,
+    chart_spec,
+    delta_data,
+    home_away_data,
+    load_datasets,
+    match_data,
+    points_data,
+)
+from src.dates import clear_parsed_dates
+from utils import home_away_delta, match_callouts, team_delta
+
+from .synth import write_league
+
+
+def measure(fn: Callable[[], object], repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "best_s": min(timings),
+        "median_s": float(np.median(timings)),
+        "peak_mb": peak / 2**20,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parents[1],
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def run(
+        data_dir: Path,
+        league: str | None,
+        repeat: int
+) -> dict[str, dict]:
+    datasets = load_datasets(data_dir, league)
+    index = datasets.team_index
+    teams = index["team_summary"].teams
+    team = teams[0]
+    seasons = datasets.compare_seasons
+    team_games = index["team_matches"].rows(team)
+
+    def each_team(fn: Callable[[str], object]) -> Callable[[], None]:
+        return lambda: [fn(t) for t in teams]
+
+    def load_cold() -> Datasets:
+        # drop the per-file parsed dates so every repeat parses them again
+        clear_parsed_dates()
+        return load_datasets(data_dir, league)
+
+    charts = {
+        "chart_delta_points": lambda: chart_delta_points(
+            delta_data(datasets.ranked_deltas, seasons), team
+        ),
+        "chart_points_by_team": lambda: chart_points_by_team(
+            points_data(datasets.team_summary, seasons), team
+        ),
+        "chart_home_away_points": lambda: chart_home_away_points(
+            home_away_data(datasets.home_away_points, seasons), team
+        ),
+        "chart_match_scatter": lambda: chart_match_scatter(
+            match_data(datasets.team_matches, team, index["team_matches"]), team
+        ),
+    }
+
+    stages = {
+        "load_datasets": load_cold,
+        "team_delta[all teams]": each_team(
+            lambda t: team_delta(datasets, t)
+        ),
+        "home_away_delta[all teams]": each_team(
+            lambda t: home_away_delta(datasets, t)
+        ),
+        # the batch frame both per-team lookups read, built uncached
+        "season_deltas[batch]": lambda: Datasets.season_deltas.func(datasets),
+    }
+    for name, build in charts.items():
+        stages[name] = build
+        stages[f"{name}+spec"] = lambda build=build: chart_spec(build())
+        stages[f"{name}+to_dict"] = lambda build=build: build().to_dict()
+    stages["match_callouts[one team]"] = lambda: match_callouts(team_games, team)
+    stages["match_callouts[all teams]"] = each_team(
+        lambda t: match_callouts(index["team_matches"].rows(t), t)
+    )
+
+    # inline to_dict would trip altair's 5,000-row guard on big leagues
+    with alt.data_transformers.disable_max_rows():
+        results = {name: measure(fn, repeat) for name, fn in stages.items()}
+
+    results["_sizes"] = {
+        "matches": len(datasets.matches),
+        "team_matches": len(datasets.team_matches),
+        "teams": len(teams),
+    }
+    return results
+
+
+def compare(current: dict, baseline: dict) -> None:
+    print(f"{'stage':<36} {'base s':>9} {'now s':>9} {'ratio':>7} {'base MB':>8} {'now MB':>8}")
+    for name, now in current["stages"].items():
+        base = baseline["stages"].get(name)
+        if name.startswith("_") or base is None:
+            continue
+        ratio = now["best_s"] / base["best_s"] if base["best_s"] else float("nan")
+        print(
+            f"{name:<36} {base['best_s']:>9.4f} {now['best_s']:>9.4f} {ratio:>7.2f} "
+            f"{base['peak_mb']:>8.2f} {now['peak_mb']:>8.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--seasons", type=int, default=10)
+    parser.add_argument("--leagues", type=int, default=1)
+    parser.add_argument("--matches", type=int, help="matches per season (default: double round robin)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.leagues):
+            write_league(
+                Path(tmp), f"SYN{i}", args.teams, args.seasons, args.matches, args.seed + i
+            )
+        league = "SYN0" if args.leagues == 1 else None
+        stages = run(Path(tmp), league, args.repeat)
+
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "params": {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+        "stages": stages,
+    }
+
+    if args.compare:
+        compare(report, json.loads(args.compare.read_text()))
+    else:
+        for name, r in stages.items():
+            if not name.startswith("_"):
+                print(f"{name:<36} {r['best_s']:>9.4f}s {r['peak_mb']:>8.2f} MB")
+        print(stages["_sizes"])
+
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Synthetic leagues with the same schema as data/PL-season-*.csv
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = [
+    "Date", "HomeTeam", "AwayTeam", "FTHG", "FTAG", "FTR", "HTHG", "HTAG", "HTR",
+    "Referee", "HS", "AS", "HST", "AST", "HF", "AF", "HC", "AC", "HY", "AY", "HR", "AR",
+]
+
+# the newest synthetic season by default; any range works, the story
+# compares the two newest seasons when SEASON_ORDER is not loaded
+LAST_SEASON_START = 2024
+
+
+def _result(home: np.ndarray, away: np.ndarray) -> np.ndarray:
+    return np.where(home > away, "H", np.where(home < away, "A", "D"))
+
+
+def synth_season(
+        rng: np.random.Generator,
+        teams: list[str],
+        start_year: int,
+        matches: int | None = None,
+        referees: int = 20
+) -> pd.DataFrame:
+    # double round robin unless a match count is given
+    home_idx, away_idx = np.nonzero(~np.eye(len(teams), dtype=bool))
+    if matches is not None:
+        pick = rng.choice(len(home_idx), size=matches, replace=matches > len(home_idx))
+        home_idx, away_idx = home_idx[pick], away_idx[pick]
+    n = len(home_idx)
+
+    strength = rng.normal(0.0, 0.35, size=len(teams))
+    fthg = rng.poisson(np.exp(0.35 + strength[home_idx] - strength[away_idx]))
+    ftag = rng.poisson(np.exp(0.10 + strength[away_idx] - strength[home_idx]))
+    hthg = rng.binomial(fthg, 0.45)
+    htag = rng.binomial(ftag, 0.45)
+    hs = fthg + rng.poisson(11, n)
+    as_ = ftag + rng.poisson(9, n)
+
+    days = np.sort(rng.integers(0, 280, size=n))
+    dates = pd.Timestamp(year=start_year, month=8, day=10) + pd.to_timedelta(days, unit="D")
+
+    df = pd.DataFrame({
+        "Date": dates.strftime("%d/%m/%y"),
+        "HomeTeam": np.asarray(teams)[home_idx],
+        "AwayTeam": np.asarray(teams)[away_idx],
+        "FTHG": fthg,
+        "FTAG": ftag,
+        "FTR": _result(fthg, ftag),
+        "HTHG": hthg,
+        "HTAG": htag,
+        "HTR": _result(hthg, htag),
+        "Referee": [f"Ref {i}" for i in rng.integers(0, referees, size=n)],
+        "HS": hs,
+        "AS": as_,
+        "HST": rng.binomial(hs, 0.35),
+        "AST": rng.binomial(as_, 0.35),
+        "HF": rng.poisson(11, n),
+        "AF": rng.poisson(11, n),
+        "HC": rng.poisson(5, n),
+        "AC": rng.poisson(4, n),
+        "HY": rng.poisson(1.8, n),
+        "AY": rng.poisson(2.0, n),
+        "HR": rng.binomial(1, 0.04, n),
+        "AR": rng.binomial(1, 0.05, n),
+    })
+    return df[COLUMNS]
+
+
+def write_league(
+        out_dir: Path,
+        league: str = "SYN",
+        teams: int = 20,
+        seasons: int = 2,
+        matches: int | None = None,
+        seed: int = 0,
+        last_season_start: int = LAST_SEASON_START
+) -> list[Path]:
+    if not 2 <= seasons <= last_season_start - 1950 + 1:
+        raise ValueError("seasons must fit two-digit season codes (1950-51 onwards)")
+
+    rng = np.random.default_rng(seed)
+    pool = [f"{league} Team {i:02d}" for i in range(int(teams * 1.5))]
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    for start in range(last_season_start - seasons + 1, last_season_start + 1):
+        # promotion/relegation churn: each season draws from a larger pool
+        season_teams = sorted(rng.choice(pool, size=teams, replace=False))
+        df = synth_season(rng, season_teams, start, matches)
+        path = out_dir / f"{league}-season-{start % 100:02d}{(start + 1) % 100:02d}.csv"
+        df.to_csv(path, index=False)
+        paths.append(path)
+    return paths
@@ -4,4 +4,9 @@ Charts, Visualizations, Etc
 
 from .data import *
 from .charts import *
+from .cache import load_cached_datasets
+from .index import TeamIndex, team_rows
+from .chart_data import *
+from .stream import stream_aggregates
+from .store import DatasetStore, Snapshot
 from .constants import SEASON_ORDER
@@ -0,0 +1,120 @@
+"""
+On-disk columnar cache for the derived Datasets frames, memory-mapped back
+in through the binary match store
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from dataclasses import fields
+from pathlib import Path
+
+from .constants import DEFAULT_LEAGUE
+from .data import DATA_DIR, Datasets, discover_season_files, load_datasets
+from .instrument import instrumented
+from .matchstore import read_frames, write_frames
+
+CACHE_DIR = Path(__file__).resolve().parents[1] / ".cache" / "datasets"
+
+# bump whenever load_datasets changes the shape or dtypes of its output
+CACHE_VERSION = 5
+
+FRAME_NAMES = [f.name for f in fields(Datasets)]
+
+
+def cache_prefix(
+        data_dir: Path | None = None,
+        league: str | None = DEFAULT_LEAGUE
+) -> str:
+    # "<league>-<data dir hash>-v<CACHE_VERSION>": entries sharing it are
+    # builds of the same source in the current layout, so a new one replaces
+    # the rest and read_latest_cache never sees another version's layout
+    data_dir = Path(data_dir).resolve() if data_dir is not None else DATA_DIR
+    source = hashlib.sha1(str(data_dir).encode()).hexdigest()[:8]
+    return f"{league or 'all'}-{source}-v{CACHE_VERSION}"
+
+
+def cache_key(
+        data_dir: Path | None = None,
+        league: str | None = DEFAULT_LEAGUE
+) -> str:
+    h = hashlib.sha1(f"v{CACHE_VERSION}|{league}".encode())
+    for season_file in discover_season_files(data_dir, league):
+        st = season_file.path.stat()
+        h.update(f"|{season_file.path.name}:{st.st_mtime_ns}:{st.st_size}".encode())
+    return f"{cache_prefix(data_dir, league)}-{h.hexdigest()[:16]}"
+
+
+def read_cache(key: str, cache_dir: Path | None = None) -> Datasets | None:
+    # the frames are read-only views of the mapped files, so processes that
+    # load the same entry share its pages instead of holding private copies
+    entry = Path(cache_dir or CACHE_DIR) / key
+    if not entry.is_dir():
+        return None
+
+    try:
+        frames = read_frames(entry)
+    except (OSError, ValueError):
+        return None
+    if frames is None or set(frames) != set(FRAME_NAMES):
+        return None
+    return Datasets(**frames)
+
+
+def read_latest_cache(
+        data_dir: Path | None = None,
+        league: str | None = DEFAULT_LEAGUE,
+        cache_dir: Path | None = None
+) -> tuple[str, Datasets] | None:
+    # newest entry for the data dir and league whatever the state of its
+    # files; the last good build, e.g. to serve while they are being loaded
+    entries = sorted(
+        Path(cache_dir or CACHE_DIR).glob(f"{cache_prefix(data_dir, league)}-*"),
+        key=lambda entry: entry.stat().st_mtime_ns,
+        reverse=True,
+    )
+    for entry in entries:
+        datasets = read_cache(entry.name, cache_dir)
+        if datasets is not None:
+            return entry.name, datasets
+    return None
+
+
+def write_cache(
+        datasets: Datasets,
+        key: str,
+        cache_dir: Path | None = None
+) -> None:
+    cache_dir = Path(cache_dir or CACHE_DIR)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    # write into a scratch dir and rename so readers never see a partial entry
+    tmp = Path(tempfile.mkdtemp(dir=cache_dir, prefix=".tmp-"))
+    try:
+        write_frames({name: getattr(datasets, name) for name in FRAME_NAMES}, tmp)
+        os.replace(tmp, cache_dir / key)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+        return
+
+    # every other build of this source, older cache versions included
+    source = key.rsplit("-", 2)[0]
+    for stale in cache_dir.glob(f"{source}-*"):
+        if stale.name != key:
+            shutil.rmtree(stale, ignore_errors=True)
+
+
+@instrumented()
+def load_cached_datasets(
+        data_dir: Path | None = None,
+        league: str | None = DEFAULT_LEAGUE,
+        cache_dir: Path | None = None
+) -> Datasets:
+    key = cache_key(data_dir, league)
+
+    datasets = read_cache(key, cache_dir)
+    if datasets is None:
+        datasets = load_datasets(data_dir, league)
+        write_cache(datasets, key, cache_dir)
+    return datasets
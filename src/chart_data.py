@@ -0,0 +1,184 @@
+"""
+Chart data layer: projected chart inputs and cached Vega-Lite specs whose
+data travels as named Arrow datasets instead of inline JSON rows
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+import altair as alt
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - streamlit serializes frames itself
+    pa = None
+
+from .index import TeamIndex, team_rows
+from .instrument import instrumented, register_gauge
+from .trajectory import PointsTrajectory
+
+DELTA_COLUMNS = ["Team", "delta_points", "Direction"]
+POINTS_COLUMNS = ["season", "Team", "Points", "Wins", "GD"]
+HOME_AWAY_COLUMNS = ["season", "Team", "Venue", "Points"]
+MATCH_COLUMNS = ["Date", "season", "Venue", "Opponent", "GF", "GA", "Points"]
+SWING_COLUMNS = ["Team", "delta", "xdelta", "luck", "swing_p05", "swing_p95", "swing_pct"]
+
+
+def _in_seasons(df: pd.DataFrame, seasons: list[str] | None) -> pd.DataFrame:
+    if seasons is None:
+        return df
+    return df.loc[df["season"].isin(seasons)]
+
+
+def delta_data(
+        ranked_deltas: pd.DataFrame,
+        seasons: list[str]
+) -> pd.DataFrame:
+    # ranked_deltas: Datasets.ranked_deltas, complete rows only; seasons: the
+    # compared (prev, curr) pair, e.g. Datasets.compare_seasons. Bar order
+    # comes from the y sort in chart_delta_points, not row order
+    return ranked_deltas[[*DELTA_COLUMNS, *seasons]]
+
+
+def points_data(
+        team_summary: pd.DataFrame,
+        seasons: list[str] | None = None
+) -> pd.DataFrame:
+    return _in_seasons(team_summary, seasons)[POINTS_COLUMNS]
+
+
+def home_away_data(
+        home_away_points: pd.DataFrame,
+        seasons: list[str] | None = None
+) -> pd.DataFrame:
+    return _in_seasons(home_away_points, seasons)[HOME_AWAY_COLUMNS]
+
+
+def match_data(
+        team_matches: pd.DataFrame,
+        team: str,
+        index: TeamIndex | None = None,
+        seasons: list[str] | None = None
+) -> pd.DataFrame:
+    return _in_seasons(team_rows(team_matches, team, index), seasons)[["Team", *MATCH_COLUMNS]]
+
+
+def trajectory_data(
+        trajectory: PointsTrajectory,
+        team: str,
+        seasons: list[str] | None = None
+) -> pd.DataFrame:
+    seasons = [s for s in (seasons or trajectory.seasons) if s in trajectory.seasons]
+    return trajectory.team_frame(team, seasons)
+
+
+def swing_data(swings: pd.DataFrame) -> pd.DataFrame:
+    return swings[SWING_COLUMNS]
+
+
+def to_arrow(df: pd.DataFrame) -> bytes | pd.DataFrame:
+    if pa is None:
+        return df
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+@instrumented()
+def chart_spec(chart: alt.TopLevelMixin) -> dict:
+    # Swap the top-level frame for a named reference; the rows ride along in
+    # spec["datasets"] as Arrow IPC bytes, which st.vega_lite_chart ships as
+    # is. No inline JSON, and no 5,000-row cap.
+    df = chart.data
+    if not isinstance(df, pd.DataFrame):
+        return chart.to_dict()
+
+    arrow = to_arrow(df)
+    digest = hashlib.sha1(
+        arrow if isinstance(arrow, bytes) else pd.util.hash_pandas_object(df).to_numpy()
+    ).hexdigest()[:16]
+    name = f"data-{digest}"
+
+    chart = chart.copy(deep=False)
+    chart.data = alt.NamedData(name=name)
+    spec = chart.to_dict()
+    spec["datasets"] = {name: arrow}
+    return spec
+
+
+# bounded LRU of compiled specs, shared by every session in the process
+class SpecCache:
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._specs: OrderedDict[tuple, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key: tuple, build: Callable[[], alt.TopLevelMixin]) -> dict:
+        with self._lock:
+            spec = self._specs.get(key)
+            if spec is not None:
+                self._specs.move_to_end(key)
+                self.hits += 1
+                return spec
+            self.misses += 1
+
+        # compile outside the lock; a racing duplicate build is harmless
+        spec = chart_spec(build())
+        with self._lock:
+            self._specs[key] = spec
+            self._specs.move_to_end(key)
+            while len(self._specs) > self.maxsize:
+                self._specs.popitem(last=False)
+        return spec
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._specs),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._specs.clear()
+            self.hits = self.misses = 0
+
+
+SPEC_CACHE = SpecCache()
+register_gauge("hw4_spec_cache", "Chart spec cache hits, misses and size", SPEC_CACHE.stats)
+
+
+def cached_spec(
+        builder: Callable[..., alt.TopLevelMixin],
+        make_data: Callable[[], pd.DataFrame],
+        version: str,
+        selected_team: str,
+        seasons: list[str],
+        league_wide: bool = False
+) -> dict:
+    # a league-wide chart's data does not depend on the team, so one spec
+    # serves every team and only its selected_team param is swapped
+    if not league_wide:
+        key = (builder.__qualname__, version, selected_team, tuple(seasons))
+        return SPEC_CACHE.get_or_build(key, lambda: builder(make_data(), selected_team))
+    key = (builder.__qualname__, version, tuple(seasons))
+    spec = SPEC_CACHE.get_or_build(key, lambda: builder(make_data(), selected_team))
+    return select_team(spec, selected_team)
+
+
+def select_team(spec: dict, selected_team: str) -> dict:
+    # shallow copy; the cached spec and its datasets are shared, not mutated
+    params = [
+        {**param, "value": selected_team} if param.get("name") == "selected_team" else param
+        for param in spec.get("params", [])
+    ]
+    return {**spec, "params": params} if params else spec
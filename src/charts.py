@@ -5,16 +5,29 @@ Reused charts from the dashboard
 import altair as alt
 import pandas as pd
 
-from .constants import SEASON_ORDER
+from .chart_data import DELTA_COLUMNS
+from .index import TeamIndex, team_rows
+from .instrument import instrumented
 
 
+def _team_param(selected_team: str) -> alt.Parameter:
+    # selection is a Vega-Lite variable, so the input frame is never copied
+    # to carry a Selected column
+    return alt.param(name="selected_team", value=selected_team)
+
+
+@instrumented()
 def chart_delta_points(
         delta_points: pd.DataFrame,
-        selected_team: str
+        selected_team: str,
+        seasons: list[str] | None = None
 ) -> alt.Chart:
-    df = delta_points.dropna(subset=["delta_points"]).copy()
-    df = df.sort_values("delta_points", ascending=True)
-    df["Selected"] = df["Team"].eq(selected_team)
+    # expects delta_data() output: complete rows only, y is sorted by
+    # Vega-Lite, and the compared pair as its only other columns
+    prev_season, curr_season = seasons or [
+        c for c in delta_points.columns if c not in DELTA_COLUMNS
+    ]
+    selected = _team_param(selected_team)
 
     team_click = alt.selection_point(
         name="delta_pick",
@@ -25,19 +38,19 @@ def chart_delta_points(
     )
 
     return (
-        alt.Chart(df)
+        alt.Chart(delta_points)
         .mark_bar()
         .encode(
             x=alt.X(
                 "delta_points:Q",
-                title="Delta points (2024-25 minus 2023-24)"
+                title=f"Delta points ({curr_season} minus {prev_season})"
             ),
             y=alt.Y("Team:N", sort=alt.SortField(
                 "delta_points",
                 order="ascending"
             ), title=None),
             color=alt.condition(
-                alt.datum.Selected,
+                alt.datum.Team == selected,
                 alt.value("#111827"),
                 alt.Color(
                     "Direction:N",
@@ -50,8 +63,8 @@ def chart_delta_points(
             ),
             tooltip=[
                 "Team:N",
-                alt.Tooltip("2023-24:Q", title="Points 2023-24"),
-                alt.Tooltip("2024-25:Q", title="Points 2024-25"),
+                alt.Tooltip(f"{prev_season}:Q", title=f"Points {prev_season}"),
+                alt.Tooltip(f"{curr_season}:Q", title=f"Points {curr_season}"),
                 alt.Tooltip(
                     "delta_points:Q",
                     title="Delta points",
@@ -59,19 +72,66 @@ def chart_delta_points(
                 ),
             ],
         )
-        .add_params(team_click)
+        .add_params(team_click, selected)
         .properties(height=720, title="Biggest swings in points")
     )
 
 
+@instrumented()
+def chart_swing_range(
+        swings: pd.DataFrame,
+        selected_team: str
+) -> alt.Chart:
+    # real swing against the 5-95% range of simulated swings (expected_swings)
+    selected = _team_param(selected_team)
+
+    base = alt.Chart(swings).encode(
+        y=alt.Y("Team:N", sort=alt.SortField("delta", order="ascending"), title=None),
+        tooltip=[
+            "Team:N",
+            alt.Tooltip("delta:Q", title="Real swing", format="+.0f"),
+            alt.Tooltip("xdelta:Q", title="Expected swing", format="+.1f"),
+            alt.Tooltip("luck:Q", title="Luck", format="+.1f"),
+            alt.Tooltip("swing_p05:Q", title="Simulated 5%", format="+.0f"),
+            alt.Tooltip("swing_p95:Q", title="Simulated 95%", format="+.0f"),
+            alt.Tooltip("swing_pct:Q", title="Share of sims at or below", format=".0%"),
+        ],
+    )
+
+    band = base.mark_rule(strokeWidth=6, opacity=0.35).encode(
+        x=alt.X("swing_p05:Q", title="Swing in points (real vs 5-95% simulated)"),
+        x2="swing_p95:Q",
+        color=alt.value("#9ca3af"),
+    )
+    expected = base.mark_tick(thickness=2, size=14, color="#111827").encode(x="xdelta:Q")
+    real = base.mark_circle(size=90, opacity=1).encode(
+        x="delta:Q",
+        color=alt.condition(
+            alt.datum.Team == selected,
+            alt.value("#111827"),
+            alt.Color(
+                "luck:Q",
+                scale=alt.Scale(scheme="redblue", domainMid=0),
+                legend=alt.Legend(title="Luck", orient="top"),
+            ),
+        ),
+    )
+
+    return (
+        alt.layer(band, expected, real)
+        .add_params(selected)
+        .properties(height=720, title="Real swing vs what the underlying numbers predict")
+    )
+
+
+@instrumented()
 def chart_points_by_team(
         team_summary: pd.DataFrame,
         selected_team: str
 ) -> alt.Chart:
-    df = team_summary.copy()
-    df["Selected"] = df["Team"].eq(selected_team)
+    selected = _team_param(selected_team)
 
-    base = alt.Chart(df).encode(
+    base = alt.Chart(team_summary).encode(
         x=alt.X("Points:Q", title="Total points"),
         y=alt.Y("Team:N", sort="-x", title=None),
         tooltip=["season:N", "Team:N", "Points:Q", "Wins:Q", "GD:Q"],
@@ -79,33 +139,34 @@ def chart_points_by_team(
 
     points = base.mark_circle(size=75).encode(
         color=alt.condition(
-            alt.datum.Selected,
+            alt.datum.Team == selected,
             alt.value("#1f77b4"),
             alt.value("#d1d5db")
         )
     )
 
     highlight = (
-        base.transform_filter(alt.datum.Selected)
+        base.transform_filter(alt.datum.Team == selected)
         .mark_circle(size=170, filled=False, stroke="#111827", strokeWidth=2)
     )
 
     return (
         alt.layer(points, highlight)
-        .facet(column=alt.Column("season:N", sort=SEASON_ORDER, title=None))
+        .add_params(selected)
+        .facet(column=alt.Column("season:N", sort="ascending", title=None))
         .properties(title="Q1: team points by season")
     )
 
 
+@instrumented()
 def chart_home_away_points(
         home_away_points: pd.DataFrame,
         selected_team: str
 ) -> alt.Chart:
-    df = home_away_points.copy()
-    df["Selected"] = df["Team"].eq(selected_team)
+    selected = _team_param(selected_team)
 
     return (
-        alt.Chart(df)
+        alt.Chart(home_away_points)
         .properties(height=420)
         .mark_bar()
         .encode(
@@ -120,22 +181,25 @@ def chart_home_away_points(
                 legend=alt.Legend(title=None, orient="top"),
             ),
             opacity=alt.condition(
-                alt.datum.Selected,
+                alt.datum.Team == selected,
                 alt.value(1.0),
                 alt.value(0.25)
             ),
             tooltip=["season:N", "Team:N", "Venue:N", "Points:Q"],
         )
-        .facet(column=alt.Column("season:N", sort=SEASON_ORDER, title=None))
+        .add_params(selected)
+        .facet(column=alt.Column("season:N", sort="ascending", title=None))
         .properties(title="Q3: home vs away points by season")
     )
 
 
+@instrumented()
 def chart_match_scatter(
         team_matches: pd.DataFrame,
-        selected_team: str
+        selected_team: str,
+        index: TeamIndex | None = None
 ) -> alt.Chart:
-    df = team_matches.loc[team_matches["Team"] == selected_team].copy()
+    df = team_rows(team_matches, selected_team, index)
 
     max_goal = max(1, int(max(df["GF"].max(), df["GA"].max())))
     brush = alt.selection_interval(name="match_brush", encodings=["x", "y"])
@@ -154,7 +218,7 @@ def chart_match_scatter(
                 title="Goals against",
                 scale=alt.Scale(domain=[-0.5, max_goal + 0.5])
             ),
-            color=alt.Color("season:N", sort=SEASON_ORDER),
+            color=alt.Color("season:N", sort="ascending"),
             shape=alt.Shape("Venue:N"),
             opacity=alt.condition(brush, alt.value(0.95), alt.value(0.2)),
             tooltip=[
@@ -173,3 +237,24 @@ def chart_match_scatter(
             title=f"Q4: Match outcomes for {selected_team} (click and drag to brush)",
         )
     )
+
+
+@instrumented()
+def chart_points_trajectory(
+        trajectory: pd.DataFrame,
+        selected_team: str
+) -> alt.Chart:
+    return (
+        alt.Chart(trajectory)
+        .mark_line(point=alt.OverlayMarkDef(size=18))
+        .encode(
+            x=alt.X("Matchday:Q", title="Matchday"),
+            y=alt.Y("Points:Q", title="Cumulative points"),
+            color=alt.Color("season:N", sort="ascending", legend=alt.Legend(title=None, orient="top")),
+            tooltip=["season:N", "Matchday:Q", "Points:Q"],
+        )
+        .properties(
+            height=360,
+            title=f"Points accumulated by {selected_team}, matchday by matchday",
+        )
+    )
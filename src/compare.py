@@ -0,0 +1,131 @@
+"""
+Season comparison engine over a precomputed season x team x venue points cube
+"""
+
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .constants import SEASON_ORDER
+
+VENUES = ["Home", "Away"]
+
+# a home/away split within this many points counts as balanced
+BALANCED_MARGIN = 3
+
+
+def compare_pair(
+        seasons: list[str],
+        override: list[str] | None = SEASON_ORDER
+) -> list[str]:
+    # the override pair when both of its seasons are loaded, else the two
+    # newest loaded seasons ("1999-00" sorts before "2000-01")
+    seasons = sorted(set(seasons))
+    if override is not None and set(override) <= set(seasons):
+        return list(override)
+    if len(seasons) < 2:
+        raise ValueError(f"need two seasons to compare, have {seasons}")
+    return seasons[-2:]
+
+
+def classify_driver(home_change, away_change):
+    home_change = np.asarray(home_change, dtype=float)
+    away_change = np.asarray(away_change, dtype=float)
+    return np.select(
+        [
+            np.isnan(home_change + away_change),
+            np.abs(home_change - away_change) <= BALANCED_MARGIN,
+            np.abs(home_change) > np.abs(away_change),
+        ],
+        ["incomplete", "balanced", "home-driven"],
+        default="away-driven",
+    )
+
+
+@dataclass(frozen=True)
+class PointsCube:
+    seasons: list[str]
+    teams: list[str]
+    # shape (season, team, venue); NaN where the team was not in the league
+    points: np.ndarray
+
+    @classmethod
+    def from_home_away_points(cls, home_away_points: pd.DataFrame) -> "PointsCube":
+        season = pd.Categorical(home_away_points["season"].astype(str))
+        team = pd.Categorical(home_away_points["Team"].astype(str))
+        venue = pd.Categorical(home_away_points["Venue"].astype(str), categories=VENUES)
+
+        points = np.full((len(season.categories), len(team.categories), len(VENUES)), np.nan)
+        points[season.codes, team.codes, venue.codes] = home_away_points["Points"].to_numpy()
+        # a team with no games yet at one venue (early in a season) has 0
+        # points there; NaN stays only for teams not in the league that season
+        present = ~np.isnan(points).all(axis=2)
+        points[present] = np.nan_to_num(points[present])
+        return cls(list(season.categories), list(team.categories), points)
+
+    def _season(self, season: str) -> np.ndarray:
+        try:
+            return self.points[self.seasons.index(season)]
+        except ValueError:
+            raise KeyError(f"unknown season {season!r}; have {self.seasons}") from None
+
+    def _frame(self, prev: np.ndarray, curr: np.ndarray, new_status: str) -> pd.DataFrame:
+        # prev/curr are (team, venue) arrays
+        in_prev = ~np.isnan(prev).all(axis=1)
+        in_curr = ~np.isnan(curr).all(axis=1)
+        keep = in_prev | in_curr
+
+        out = pd.DataFrame({
+            "Team": self.teams,
+            "status": np.select(
+                [in_prev & in_curr, in_curr],
+                ["both", new_status],
+                default="relegated",
+            ),
+            "home_prev": prev[:, 0],
+            "home_curr": curr[:, 0],
+            "away_prev": prev[:, 1],
+            "away_curr": curr[:, 1],
+        })[keep]
+        out["points_prev"] = out["home_prev"] + out["away_prev"]
+        out["points_curr"] = out["home_curr"] + out["away_curr"]
+        out["delta"] = out["points_curr"] - out["points_prev"]
+        out["home_change"] = out["home_curr"] - out["home_prev"]
+        out["away_change"] = out["away_curr"] - out["away_prev"]
+        out["driver"] = classify_driver(out["home_change"], out["away_change"])
+        out["Direction"] = np.where(out["delta"] >= 0, "Rise", "Fall")
+        out.loc[out["delta"].isna(), "Direction"] = None
+        return out.sort_values("delta", ascending=False, na_position="last").reset_index(drop=True)
+
+    def compare(self, prev_season: str, curr_season: str) -> pd.DataFrame:
+        return self._frame(self._season(prev_season), self._season(curr_season), "promoted")
+
+    def compare_by_team(self, prev_season: str, curr_season: str) -> pd.DataFrame:
+        # compare() indexed by team, with the home + away total change
+        out = self.compare(prev_season, curr_season).set_index("Team")
+        out["total_change"] = out["home_change"] + out["away_change"]
+        return out
+
+    def compare_window(self, curr_season: str, window: int = 3) -> pd.DataFrame:
+        # curr_season against each team's mean over the `window` seasons before
+        # it; teams with no season in the window are "new"
+        curr = self._season(curr_season)
+        i = self.seasons.index(curr_season)
+        past = self.points[max(0, i - window):i]
+        if not len(past):
+            return self._frame(np.full_like(curr, np.nan), curr, "new")
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN team -> NaN
+            prev = np.nanmean(past, axis=0)
+        return self._frame(prev, curr, "new")
+
+    def risers_fallers(
+            self,
+            prev_season: str,
+            curr_season: str,
+            k: int = 1
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        both = self.compare(prev_season, curr_season).dropna(subset=["delta"])
+        return both.head(k), both.tail(k).iloc[::-1]
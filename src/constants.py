@@ -2,4 +2,10 @@
 Constants
 """
 
+# The pair of seasons the story prefers to compare (older first). Only an
+# override: when either is missing from the data, the two newest loaded
+# seasons are compared instead (src.compare.compare_pair).
 SEASON_ORDER = ["2023-24", "2024-25"]
+
+DEFAULT_LEAGUE = "PL"
+SEASON_FILE_GLOB = "*-season-*.csv"
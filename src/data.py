@@ -2,11 +2,48 @@
 Data Processing section from notebook modified for app
 """
 
-import numpy as np
-import pandas as pd
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
+from .constants import DEFAULT_LEAGUE, SEASON_FILE_GLOB, SEASON_ORDER
+from .compare import PointsCube, compare_pair
+from .dates import parse_dates, parse_file_dates
+from .index import TeamIndex
+from .instrument import instrumented
+from .matchups import MatchupCube
+from .schema import apply_schema
+from .table import LeagueTable
+from .trajectory import PointsTrajectory
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+
+VENUES = ["Home", "Away"]
+
+# natural key of a fixture; match_id is just its row number in `matches`
+MATCH_KEY = ["season", "Date", "HomeTeam", "AwayTeam"]
+
+# team_matches column -> (home side source, away side source)
+SIDE_COLUMNS = {
+    "GF": ("FTHG", "FTAG"),
+    "GA": ("FTAG", "FTHG"),
+    "Points": ("home_points", "away_points"),
+    "Shots": ("HS", "AS"),
+    "SOT": ("HST", "AST"),
+    "Fouls": ("HF", "AF"),
+    "Corners": ("HC", "AC"),
+    "Yellow": ("HY", "AY"),
+    "Red": ("HR", "AR"),
+}
+
+SEASON_FILE_RE = re.compile(r"^(?P<league>.+)-season-(?P<code>\d{4})\.csv$")
+
 
 @dataclass(frozen=True)
 class Datasets:
@@ -16,21 +53,226 @@ class Datasets:
     home_away_points: pd.DataFrame
     delta_points: pd.DataFrame
 
+    @cached_property
+    def team_index(self) -> dict[str, TeamIndex]:
+        return {
+            name: TeamIndex(getattr(self, name))
+            for name in ("team_matches", "team_summary", "home_away_points")
+        }
+
+    def prime(self) -> "Datasets":
+        # compute the lazy members now, e.g. before the object gets pickled
+        (self.team_index, self.version, self.points_cube, self.compare_seasons,
+         self.season_deltas, self.ranked_deltas, self.trajectory, self.league_table,
+         self.matchups)
+        return self
+
+    @cached_property
+    def points_cube(self) -> PointsCube:
+        return PointsCube.from_home_away_points(self.home_away_points)
+
+    @cached_property
+    def compare_seasons(self) -> list[str]:
+        # the (prev, curr) pair the story compares; see compare_pair
+        return compare_pair(self.points_cube.seasons)
+
+    @cached_property
+    def season_deltas(self) -> pd.DataFrame:
+        # the compare_seasons swing, one row per team; the per-team helpers
+        # in utils.deltas are lookups into this
+        return self.points_cube.compare_by_team(*self.compare_seasons)
+
+    @cached_property
+    def ranked_deltas(self) -> pd.DataFrame:
+        # delta_points rows with a swing, biggest riser first; what the delta
+        # chart and the riser/faller metrics read on every rerun
+        complete = self.delta_points.dropna(subset=["delta_points"])
+        return complete.sort_values("delta_points", ascending=False)
+
+    @cached_property
+    def trajectory(self) -> PointsTrajectory:
+        return PointsTrajectory.from_team_matches(self.team_matches)
+
+    @cached_property
+    def league_table(self) -> LeagueTable:
+        return LeagueTable.from_team_matches(self.team_matches)
+
+    @cached_property
+    def matchups(self) -> MatchupCube:
+        return MatchupCube.from_team_matches(self.team_matches)
+
+    @cached_property
+    def version(self) -> str:
+        # content fingerprint; everything else is derived from `matches`
+        hashes = pd.util.hash_pandas_object(self.matches, index=False).to_numpy()
+        return hashlib.sha1(hashes).hexdigest()[:12]
+
+
+@dataclass(frozen=True)
+class SeasonFile:
+    path: Path
+    league: str
+    season: str
+
+
+def season_label(code: str) -> str:
+    # "2324" -> "2023-24", "9900" -> "1999-00"
+    start = int(code[:2])
+    century = 1900 if start >= 50 else 2000
+    return f"{century + start}-{code[2:]}"
+
+
+def discover_season_files(
+        data_dir: Path | None = None,
+        league: str | None = DEFAULT_LEAGUE
+) -> list[SeasonFile]:
+    data_dir = Path(data_dir) if data_dir is not None else DATA_DIR
+
+    files = []
+    for path in data_dir.glob(SEASON_FILE_GLOB):
+        m = SEASON_FILE_RE.match(path.name)
+        if m is None:
+            continue
+        if league is not None and m["league"] != league:
+            continue
+        files.append(SeasonFile(path, m["league"], season_label(m["code"])))
+
+    return sorted(files, key=lambda f: (f.league, f.season))
+
+
+def _read_season(season_file: SeasonFile) -> pd.DataFrame:
+    df = pd.read_csv(season_file.path)
+    df["Date"], _ = parse_file_dates(df["Date"], season_file.path)
+    df["league"] = season_file.league
+    df["season"] = season_file.season
+    return df
+
+
+@instrumented()
+def load_datasets(
+        data_dir: Path | None = None,
+        league: str | None = DEFAULT_LEAGUE,
+        max_workers: int | None = None
+) -> Datasets:
+    files = discover_season_files(data_dir, league)
+    if not files:
+        raise FileNotFoundError(
+            f"no season files matching {SEASON_FILE_GLOB!r} for league {league!r}"
+        )
+
+    # pd.read_csv releases the GIL while tokenizing, so threads overlap well
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        frames = list(pool.map(_read_season, files))
+
+    matches = _prepare_matches(pd.concat(frames, ignore_index=True))
+    team_matches = _team_matches(matches)
+    team_summary = _team_summary(team_matches)
+    home_away_points = _home_away_points(team_matches)
+
+    return Datasets(
+        matches=matches,
+        team_matches=team_matches,
+        team_summary=team_summary,
+        home_away_points=home_away_points,
+        delta_points=_delta_points(home_away_points),
+    )
+
+
+def append_matches(
+        datasets: Datasets,
+        new_rows: pd.DataFrame,
+        season: str | None = None,
+        league: str = DEFAULT_LEAGUE
+) -> Datasets:
+    # Fold a handful of new raw rows (CSV schema) into existing Datasets.
+    # Aggregates are updated by adding the new rows' group sums, so the cost
+    # follows len(new_rows) and the number of teams, not the match history.
+    new = new_rows.copy()
+    if season is not None:
+        new["season"] = season
+    if "season" not in new:
+        raise ValueError("new rows need a 'season' column or the season argument")
+    new["league"] = league
+
+    # match_id is the row number, so the next id needs no scan
+    new_matches = _prepare_matches(new, first_id=len(datasets.matches))
+    # only the seasons being appended to can hold a duplicate
+    loaded = datasets.matches.loc[
+        datasets.matches["season"].isin(new_matches["season"].unique()), MATCH_KEY
+    ]
+    dupes = pd.MultiIndex.from_frame(new_matches[MATCH_KEY]).isin(
+        pd.MultiIndex.from_frame(loaded)
+    )
+    if dupes.any():
+        raise ValueError(
+            f"{int(dupes.sum())} rows are already loaded: "
+            + ", ".join(
+                f"{row.season} {row.Date:%Y-%m-%d} {row.HomeTeam} v {row.AwayTeam}"
+                for row in new_matches.loc[dupes, MATCH_KEY].head(3).itertuples(index=False)
+            )
+        )
+
+    new_team_matches = _team_matches(new_matches)
+    team_matches = _concat([datasets.team_matches, new_team_matches])
+    home_away_points = _add_aggregates(
+        datasets.home_away_points,
+        _home_away_points(new_team_matches),
+        ["season", "Team", "Venue"],
+    )
+
+    return Datasets(
+        matches=_concat([datasets.matches, new_matches]),
+        team_matches=team_matches,
+        team_summary=_add_aggregates(
+            datasets.team_summary, _team_summary(new_team_matches), ["season", "Team"]
+        ),
+        home_away_points=home_away_points,
+        delta_points=_delta_points(home_away_points),
+    )
 
-def load_datasets() -> Datasets:
-    data_dir = Path(__file__).resolve().parents[1] / "data"
 
-    df_2324 = pd.read_csv(data_dir / "PL-season-2324.csv")
-    df_2425 = pd.read_csv(data_dir / "PL-season-2425.csv")
+def _concat(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    # pd.concat falls back to object dtype when categories differ, so widen
+    # every categorical column to the union of categories first. The union
+    # keeps the first frame's categories in order, so when the new rows add
+    # none (the usual matchday) only the small frames are converted
+    frames = list(frames)
+    for col in frames[0].columns:
+        if not isinstance(frames[0][col].dtype, pd.CategoricalDtype):
+            continue
+        categories = frames[0][col].cat.categories
+        for df in frames[1:]:
+            categories = categories.union(df[col].astype("category").cat.categories, sort=False)
+        dtype = pd.CategoricalDtype(categories)
+        frames = [
+            df if df[col].dtype == dtype else df.assign(**{col: df[col].astype(dtype)})
+            for df in frames
+        ]
+    return pd.concat(frames, ignore_index=True)
 
-    df_2324["season"] = "2023-24"
-    df_2425["season"] = "2024-25"
 
-    matches = pd.concat([df_2324, df_2425], ignore_index=True)
-    matches["Date"] = pd.to_datetime(
-        matches["Date"], dayfirst=True, format="mixed"
+def _add_aggregates(
+        current: pd.DataFrame,
+        update: pd.DataFrame,
+        keys: list[str]
+) -> pd.DataFrame:
+    dtypes = current.drop(columns=keys).dtypes.to_dict()
+    both = _concat([current, update])
+    current, update = both.iloc[:len(current)], both.iloc[len(current):]
+    return (
+        current.set_index(keys)
+        .add(update.set_index(keys), fill_value=0)
+        .astype(dtypes)
+        .reset_index()
     )
 
+
+def _prepare_matches(matches: pd.DataFrame, first_id: int = 0) -> pd.DataFrame:
+    if not pd.api.types.is_datetime64_any_dtype(matches["Date"]):
+        matches["Date"], report = parse_dates(matches["Date"], "appended rows")
+        if not report.clean:
+            raise ValueError(report.describe())
+
     matches["home_points"] = np.where(
         matches["FTR"] == "H",
         3,
@@ -45,99 +287,56 @@ def load_datasets() -> Datasets:
     matches["total_goals"] = matches["FTHG"] + matches["FTAG"]
     matches["goal_diff"] = matches["FTHG"] - matches["FTAG"]
 
-    matches["match_id"] = (
-        matches["season"].astype(str)
-        + "|"
-        + matches["Date"].dt.strftime("%Y-%m-%d")
-        + "|"
-        + matches["HomeTeam"].astype(str)
-        + "|"
-        + matches["AwayTeam"].astype(str)
-    )
+    matches["match_id"] = np.arange(first_id, first_id + len(matches), dtype=np.int32)
+    return apply_schema(matches, "matches")
 
-    home_rows = matches[
-        [
-            "match_id",
-            "season",
-            "Date",
-            "HomeTeam",
-            "AwayTeam",
-            "Referee",
-            "FTHG",
-            "FTAG",
-            "home_points",
-            "away_points",
-            "HS",
-            "HST",
-            "HF",
-            "HC",
-            "HY",
-            "HR",
-        ]
-    ].copy()
-
-    home_rows.rename(
-        columns={
-            "HomeTeam": "Team",
-            "AwayTeam": "Opponent",
-            "FTHG": "GF",
-            "FTAG": "GA",
-            "home_points": "Points",
-            "HS": "Shots",
-            "HST": "SOT",
-            "HF": "Fouls",
-            "HC": "Corners",
-            "HY": "Yellow",
-            "HR": "Red",
-        },
-        inplace=True,
-    )
-    home_rows["Venue"] = "Home"
-
-    away_rows = matches[
-        [
-            "match_id",
-            "season",
-            "Date",
-            "HomeTeam",
-            "AwayTeam",
-            "Referee",
-            "FTHG",
-            "FTAG",
-            "home_points",
-            "away_points",
-            "AS",
-            "AST",
-            "AF",
-            "AC",
-            "AY",
-            "AR",
-        ]
-    ].copy()
-
-    away_rows.rename(
-        columns={
-            "AwayTeam": "Team",
-            "HomeTeam": "Opponent",
-            "FTAG": "GF",
-            "FTHG": "GA",
-            "away_points": "Points",
-            "AS": "Shots",
-            "AST": "SOT",
-            "AF": "Fouls",
-            "AC": "Corners",
-            "AY": "Yellow",
-            "AR": "Red",
-        },
-        inplace=True,
+
+def _team_matches(matches: pd.DataFrame) -> pd.DataFrame:
+    # Stack the home view of every match on top of the away view straight
+    # from the column buffers: shared columns are tiled, per-side columns are
+    # concatenated home-then-away, and Team/Opponent share one factorization.
+    n = len(matches)
+
+    teams = pd.Categorical(
+        np.concatenate([matches["HomeTeam"].to_numpy(), matches["AwayTeam"].to_numpy()])
     )
-    away_rows["Venue"] = "Away"
+    codes = teams.codes
+
+    columns = {
+        "match_id": np.tile(matches["match_id"].to_numpy(), 2),
+        "season": _tile_category(matches["season"]),
+        "Date": np.tile(matches["Date"].to_numpy(), 2),
+        "Team": teams,
+        "Opponent": pd.Categorical.from_codes(
+            np.concatenate([codes[n:], codes[:n]]), dtype=teams.dtype
+        ),
+        "Referee": _tile_category(matches["Referee"]),
+        "Venue": pd.Categorical.from_codes(
+            np.repeat(np.array([0, 1], dtype=np.int8), n), categories=VENUES
+        ),
+    }
+    for name, (home_col, away_col) in SIDE_COLUMNS.items():
+        columns[name] = _stack(matches[home_col], matches[away_col])
+    columns["GD"] = columns["GF"] - columns["GA"]
+    columns["Win"] = (columns["Points"] == 3).astype(np.int8)
+
+    return apply_schema(pd.DataFrame(columns, copy=False), "team_matches")
+
+
+def _stack(home: pd.Series, away: pd.Series):
+    if isinstance(home.dtype, np.dtype) and home.dtype == away.dtype:
+        return np.concatenate([home.to_numpy(), away.to_numpy()])
+    # nullable columns (stats missing for some rows) keep their mask
+    return pd.concat([home, away], ignore_index=True).array
+
+
+def _tile_category(values: pd.Series) -> pd.Categorical:
+    cat = pd.Categorical(values)
+    return pd.Categorical.from_codes(np.tile(cat.codes, 2), dtype=cat.dtype)
 
-    team_matches = pd.concat([home_rows, away_rows], ignore_index=True)
-    team_matches["GD"] = team_matches["GF"] - team_matches["GA"]
-    team_matches["Win"] = (team_matches["Points"] == 3).astype(int)
 
-    team_summary = team_matches.groupby(["season", "Team"], as_index=False).agg(
+def _team_summary(team_matches: pd.DataFrame) -> pd.DataFrame:
+    team_summary = team_matches.groupby(["season", "Team"], as_index=False, observed=True).agg(
         Points=("Points", "sum"),
         GF=("GF", "sum"),
         GA=("GA", "sum"),
@@ -145,27 +344,41 @@ def load_datasets() -> Datasets:
         Wins=("Win", "sum"),
         Matches=("match_id", "nunique"),
     )
+    return apply_schema(team_summary, "team_summary")
 
+
+def _home_away_points(team_matches: pd.DataFrame) -> pd.DataFrame:
     home_away_points = team_matches.groupby(
         ["season", "Team", "Venue"],
         as_index=False,
+        observed=True,
     ).agg(Points=("Points", "sum"))
+    return apply_schema(home_away_points, "home_away_points")
 
-    wide = team_summary.pivot(
-        index="Team", columns="season", values="Points"
-    ).reset_index()
-    wide["delta_points"] = wide["2024-25"] - wide["2023-24"]
-    wide["Direction"] = np.where(wide["delta_points"] >= 0, "Rise", "Fall")
 
-    valid_delta = wide.dropna(subset=["delta_points"])
-    top_team = valid_delta.loc[valid_delta["delta_points"].idxmax(), "Team"]
-    bottom_team = valid_delta.loc[valid_delta["delta_points"].idxmin(), "Team"]
-    wide["is_extreme"] = wide["Team"].isin([top_team, bottom_team])
+def _delta_points(
+        home_away_points: pd.DataFrame,
+        override: list[str] | None = SEASON_ORDER
+) -> pd.DataFrame:
+    # season totals for every loaded season, plus the compared pair's swing
+    # from the season comparison engine
+    cube = PointsCube.from_home_away_points(home_away_points)
+    prev_season, curr_season = compare_pair(cube.seasons, override)
 
-    return Datasets(
-        matches=matches,
-        team_matches=team_matches,
-        team_summary=team_summary,
-        home_away_points=home_away_points,
-        delta_points=wide,
+    totals = cube.points.sum(axis=2)  # NaN where the team was not in the league
+    wide = pd.DataFrame({"Team": cube.teams})
+    for i, season in enumerate(cube.seasons):
+        wide[season] = pd.array(totals[i], dtype="Int16")
+    compared = cube.compare(prev_season, curr_season).set_index("Team").reindex(cube.teams)
+    wide["delta_points"] = pd.array(compared["delta"].to_numpy(), dtype="Int16")
+    wide["Direction"] = compared["Direction"].fillna("Fall").to_numpy()
+
+    # no team may play both seasons, e.g. two unrelated leagues
+    valid_delta = wide.dropna(subset=["delta_points"])
+    extremes = (
+        [valid_delta.loc[valid_delta["delta_points"].idxmax(), "Team"],
+         valid_delta.loc[valid_delta["delta_points"].idxmin(), "Team"]]
+        if len(valid_delta) else []
     )
+    wide["is_extreme"] = wide["Team"].isin(extremes)
+    return apply_schema(wide, "delta_points")
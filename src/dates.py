@@ -0,0 +1,112 @@
+"""
+Format-explicit date parsing: one format per source file, no per-element guessing
+"""
+
+import re
+import warnings
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+
+# football-data style sources are day-first; each format has a shape that
+# identifies it without trying to parse
+DATE_FORMATS = {
+    "%d/%m/%y": re.compile(r"^\d{1,2}/\d{1,2}/\d{2}$"),
+    "%d/%m/%Y": re.compile(r"^\d{1,2}/\d{1,2}/\d{4}$"),
+    "%Y-%m-%d": re.compile(r"^\d{4}-\d{1,2}-\d{1,2}$"),
+}
+
+
+class DateParseWarning(UserWarning):
+    pass
+
+
+@dataclass(frozen=True)
+class DateParseReport:
+    source: str
+    format: str | None
+    rows: int
+    # rows whose shape matched a different format, parsed with that format
+    other_formats: dict[str, int] = field(default_factory=dict)
+    # positions of rows that matched no format or named an impossible date
+    unparsed: list[int] = field(default_factory=list)
+
+    @property
+    def clean(self) -> bool:
+        return not self.other_formats and not self.unparsed
+
+    def describe(self) -> str:
+        parts = [f"{self.source}: {self.rows} dates, detected format {self.format}"]
+        for fmt, count in self.other_formats.items():
+            parts.append(f"{count} rows were {fmt}")
+        if self.unparsed:
+            parts.append(f"{len(self.unparsed)} unparseable rows at {self.unparsed[:5]}")
+        return "; ".join(parts)
+
+
+def _shapes(values: pd.Series) -> pd.Series:
+    shape = pd.Series(None, index=values.index, dtype=object)
+    for fmt, pattern in DATE_FORMATS.items():
+        shape[values.str.match(pattern).fillna(False).to_numpy()] = fmt
+    return shape
+
+
+def detect_format(values: pd.Series, sample: int = 1000) -> str | None:
+    counts = _shapes(values.dropna().astype(str).str.strip().head(sample)).value_counts()
+    return counts.index[0] if len(counts) else None
+
+
+def parse_dates(
+        values: pd.Series,
+        source: str = "<dates>"
+) -> tuple[pd.Series, DateParseReport]:
+    # fast path: one vectorized parse with the detected format; only rows
+    # that fail it are classified by shape and parsed with their own format
+    fmt = detect_format(values)
+    if fmt is None:
+        parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    else:
+        parsed = pd.to_datetime(values, format=fmt, errors="coerce")
+
+    other_formats = {}
+    failed = (parsed.isna() & values.notna()).to_numpy()
+    if failed.any():
+        text = values[failed].astype(str).str.strip()
+        shapes = _shapes(text)
+        for shape_fmt, count in shapes.value_counts().items():
+            if shape_fmt == fmt:
+                continue
+            rows = shapes.index[(shapes == shape_fmt).to_numpy()]
+            parsed[rows] = pd.to_datetime(text[rows], format=shape_fmt, errors="coerce")
+            other_formats[shape_fmt] = int(count)
+
+    unparsed = [int(i) for i in (parsed.isna() & values.notna()).to_numpy().nonzero()[0]]
+    report = DateParseReport(source, fmt, len(values), other_formats, unparsed)
+    return parsed, report
+
+
+# path -> ((mtime_ns, size), parsed dates, report), so re-reads of an
+# unchanged file skip parsing; one entry per file, replaced when it changes
+_PARSED: dict[str, tuple[tuple[int, int], pd.Series, DateParseReport]] = {}
+
+
+def clear_parsed_dates() -> None:
+    # forget every file's parsed dates, e.g. to time a cold load
+    _PARSED.clear()
+
+
+def parse_file_dates(
+        values: pd.Series,
+        path: Path
+) -> tuple[pd.Series, DateParseReport]:
+    st = Path(path).stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _PARSED.get(str(path))
+    if cached is None or cached[0] != stamp or len(cached[1]) != len(values):
+        cached = _PARSED[str(path)] = (stamp, *parse_dates(values, Path(path).name))
+
+    _, parsed, report = cached
+    if not report.clean:
+        warnings.warn(report.describe(), DateParseWarning, stacklevel=2)
+    return parsed.set_axis(values.index), report
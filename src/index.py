@@ -0,0 +1,38 @@
+"""
+Team-keyed positional index so per-team lookups skip the full-frame scan
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class TeamIndex:
+    def __init__(self, df: pd.DataFrame, column: str = "Team"):
+        self.df = df
+        self.positions: dict[str, np.ndarray] = {
+            str(team): pos
+            for team, pos in df.groupby(column, observed=True, sort=False).indices.items()
+        }
+
+    def __contains__(self, team: str) -> bool:
+        return team in self.positions
+
+    @property
+    def teams(self) -> list[str]:
+        return sorted(self.positions)
+
+    def rows(self, team: str) -> pd.DataFrame:
+        pos = self.positions.get(team)
+        if pos is None:
+            return self.df.iloc[:0]
+        return self.df.iloc[pos]
+
+
+def team_rows(
+        df: pd.DataFrame,
+        team: str,
+        index: TeamIndex | None = None
+) -> pd.DataFrame:
+    if index is not None and index.df is df:
+        return index.rows(team)
+    return df.loc[df["Team"] == team]
@@ -0,0 +1,169 @@
+"""
+Per-rerun stage instrumentation: wall time, allocations and row counts
+
+Disabled unless HW4_INSTRUMENT is set ("1" for timings, "memory" to also
+trace allocations); a disabled stage is one global lookup per call.
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+_MODE = os.environ.get("HW4_INSTRUMENT", "").strip().lower()
+ENABLED = _MODE not in ("", "0", "false", "off")
+TRACE_MEMORY = _MODE == "memory"
+
+_local = threading.local()
+_totals_lock = threading.Lock()
+# stage -> [calls, seconds, alloc_bytes, rows]
+_totals: dict[str, list[float]] = {}
+# metric -> (help text, reader returning {stat: value}), read at export time
+_gauges: dict[str, tuple[str, Callable[[], dict[str, float]]]] = {}
+
+
+@dataclass
+class StageRecord:
+    stage: str
+    seconds: float
+    alloc_bytes: int | None = None
+    rows: int | None = None
+
+
+def set_enabled(enabled: bool, trace_memory: bool = False) -> None:
+    global ENABLED, TRACE_MEMORY
+    ENABLED = enabled
+    TRACE_MEMORY = enabled and trace_memory
+    if TRACE_MEMORY and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def _count_rows(args: tuple, result: object) -> int | None:
+    # rows produced if the stage returns a frame/list, else rows consumed
+    for value in (result, args[0] if args else None):
+        if hasattr(value, "shape") or isinstance(value, list):
+            return len(value)
+    return None
+
+
+def _record(record: StageRecord) -> None:
+    records = getattr(_local, "records", None)
+    if records is not None:
+        records.append(record)
+    with _totals_lock:
+        totals = _totals.setdefault(record.stage, [0, 0.0, 0, 0])
+        totals[0] += 1
+        totals[1] += record.seconds
+        totals[2] += record.alloc_bytes or 0
+        totals[3] += record.rows or 0
+
+
+@contextmanager
+def stage(name: str) -> Iterator[StageRecord | None]:
+    if not ENABLED:
+        yield None
+        return
+    record = StageRecord(name, 0.0)
+    tracing = TRACE_MEMORY and tracemalloc.is_tracing()
+    if tracing:
+        alloc_before = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record.seconds = time.perf_counter() - t0
+        if tracing:
+            record.alloc_bytes = tracemalloc.get_traced_memory()[0] - alloc_before
+        _record(record)
+
+
+def instrumented(name: str | None = None) -> Callable:
+    def wrap(fn: Callable) -> Callable:
+        stage_name = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            with stage(stage_name) as record:
+                result = fn(*args, **kwargs)
+                record.rows = _count_rows(args, result)
+            return result
+
+        return inner
+
+    return wrap
+
+
+def start_rerun() -> None:
+    # collect the records of one Streamlit rerun (runs on the session thread)
+    if ENABLED:
+        _local.records = []
+        _local.started = time.perf_counter()
+
+
+def finish_rerun(label: str = "rerun") -> list[StageRecord]:
+    records = getattr(_local, "records", None)
+    if records is None:
+        return []
+    _local.records = None
+    log_records(records, label, time.perf_counter() - _local.started)
+    return records
+
+
+def log_records(records: list[StageRecord], label: str, seconds: float) -> None:
+    logger.info(json.dumps({
+        "event": label,
+        "seconds": round(seconds, 6),
+        "stages": [asdict(r) for r in records],
+    }))
+
+
+def prometheus_text(prefix: str = "hw4_stage") -> str:
+    # process-wide totals in the Prometheus text exposition format
+    with _totals_lock:
+        totals = {k: list(v) for k, v in _totals.items()}
+    metrics = [
+        ("calls_total", 0, "Instrumented calls"),
+        ("seconds_total", 1, "Wall time spent in the stage"),
+        ("alloc_bytes_total", 2, "Net bytes allocated (HW4_INSTRUMENT=memory)"),
+        ("rows_total", 3, "Rows produced or consumed"),
+    ]
+    lines = []
+    for suffix, i, help_text in metrics:
+        metric = f"{prefix}_{suffix}"
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+        lines += [
+            f'{metric}{{stage="{stage_name}"}} {values[i]:.6g}'
+            for stage_name, values in sorted(totals.items())
+        ]
+    for metric, (help_text, read) in sorted(_gauges.items()):
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+        lines += [f'{metric}{{stat="{stat}"}} {value:.6g}' for stat, value in read().items()]
+    return "\n".join(lines) + "\n"
+
+
+def register_gauge(
+        metric: str,
+        help_text: str,
+        read: Callable[[], dict[str, float]]
+) -> None:
+    # export read()'s stats with prometheus_text, e.g. a cache's hit counts
+    _gauges[metric] = (help_text, read)
+
+
+def reset_totals() -> None:
+    with _totals_lock:
+        _totals.clear()
+
+
+if TRACE_MEMORY and not tracemalloc.is_tracing():
+    tracemalloc.start()
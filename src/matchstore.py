@@ -0,0 +1,116 @@
+"""
+Binary match store: fixed-width column sections in one file per frame,
+memory-mapped back into DataFrames without copying, so every process on a
+host shares one page-cache copy of the match-level data
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+STORE_FORMAT = 1
+
+# section alignment, so every column view starts on a cache line
+ALIGN = 64
+
+META_NAME = "store.json"
+
+
+def _encode(series: pd.Series) -> tuple[dict, list[np.ndarray]]:
+    # -> (column metadata, sections to write)
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return (
+            {"kind": "category", "categories": [str(c) for c in dtype.categories],
+             "ordered": bool(dtype.ordered)},
+            [series.cat.codes.to_numpy()],
+        )
+    if isinstance(dtype, np.dtype) and dtype.kind == "M":
+        return {"kind": "datetime", "dtype": str(dtype)}, [series.to_numpy().view(np.int64)]
+    if isinstance(dtype, np.dtype) and dtype.kind in "biuf":
+        return {"kind": "numeric"}, [series.to_numpy()]
+    if isinstance(dtype, pd.api.extensions.ExtensionDtype) and dtype.kind in "biuf":
+        # nullable Int/Float/boolean: the values plus a separate NA mask
+        return {"kind": "masked", "dtype": str(dtype)}, [
+            series.to_numpy(dtype=dtype.numpy_dtype, na_value=0),
+            series.isna().to_numpy(),
+        ]
+    if pd.api.types.is_string_dtype(dtype) or dtype == object:
+        # free text is dictionary encoded too, and reads back as a category
+        return _encode(series.astype("category"))
+    raise TypeError(f"cannot store column {series.name!r} of dtype {dtype}")
+
+
+def _decode(meta: dict, sections: list[np.ndarray]) -> pd.api.extensions.ExtensionArray | np.ndarray:
+    kind = meta["kind"]
+    if kind == "category":
+        dtype = pd.CategoricalDtype(meta["categories"], ordered=meta["ordered"])
+        return pd.Categorical.from_codes(sections[0], dtype=dtype, validate=False)
+    if kind == "datetime":
+        return pd.arrays.DatetimeArray._from_sequence(
+            sections[0].view(meta["dtype"]), dtype=np.dtype(meta["dtype"]), copy=False
+        )
+    if kind == "numeric":
+        return sections[0]
+    if kind == "masked":
+        return pd.api.types.pandas_dtype(meta["dtype"]).construct_array_type()(
+            sections[0], sections[1], copy=False
+        )
+    raise ValueError(f"unknown column kind {kind!r}")
+
+
+def write_frames(frames: dict[str, pd.DataFrame], path: Path) -> None:
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    meta = {"format": STORE_FORMAT, "frames": {}}
+
+    for name, df in frames.items():
+        columns = []
+        offset = 0
+        with open(path / f"{name}.bin", "wb") as f:
+            for col in df.columns:
+                col_meta, sections = _encode(df[col])
+                col_meta["name"] = str(col)
+                col_meta["sections"] = []
+                for section in sections:
+                    section = np.ascontiguousarray(section)
+                    pad = -offset % ALIGN
+                    f.write(b"\0" * pad)
+                    offset += pad
+                    col_meta["sections"].append([offset, section.dtype.str])
+                    f.write(section.tobytes())
+                    offset += section.nbytes
+                columns.append(col_meta)
+        meta["frames"][name] = {"rows": len(df), "columns": columns}
+
+    (path / META_NAME).write_text(json.dumps(meta))
+
+
+def read_frames(path: Path) -> dict[str, pd.DataFrame] | None:
+    # None when the store is missing or was written by another format
+    path = Path(path)
+    try:
+        meta = json.loads((path / META_NAME).read_text())
+    except (OSError, ValueError):
+        return None
+    if meta.get("format") != STORE_FORMAT:
+        return None
+
+    frames = {}
+    for name, frame in meta["frames"].items():
+        rows = frame["rows"]
+        buffer = (
+            np.memmap(path / f"{name}.bin", dtype=np.uint8, mode="r")
+            if rows else np.empty(0, dtype=np.uint8)
+        )
+        columns = {}
+        for col in frame["columns"]:
+            sections = [
+                np.asarray(buffer[offset:offset + rows * np.dtype(dtype).itemsize]).view(dtype)
+                for offset, dtype in col["sections"]
+            ]
+            columns[col["name"]] = _decode(col, sections)
+        frames[name] = pd.DataFrame(columns, copy=False)
+    return frames
@@ -0,0 +1,172 @@
+"""
+Match aggregates over season x team x venue x opponent x referee, stored as
+integer-coded non-empty cells and answered with slice + roll-up queries
+"""
+
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+DIMENSIONS = ["season", "Team", "Venue", "Opponent", "Referee"]
+MEASURES = [
+    "Matches", "Won", "Drawn", "Lost", "Points", "GF", "GA",
+    "Shots", "SOT", "Fouls", "Corners", "Yellow", "Red",
+]
+# team_matches columns summed as is; missing match stats count as 0
+SUMMED = ["Points", "GF", "GA", "Shots", "SOT", "Fouls", "Corners", "Yellow", "Red"]
+
+UNKNOWN_REFEREE = "Unknown"
+
+# roll-ups built with the cube for the app's panels: the season table and
+# results under each referee. A query reads the smallest cube covering its
+# dimensions. Results by venue against given opponents need no roll-up: in a
+# double round robin season x team x venue x opponent is already one match
+# per cell, so they read the full cube.
+ROLLUPS = [
+    ["season", "Team"],
+    ["season", "Team", "Referee"],
+]
+
+
+@dataclass(frozen=True)
+class MatchupCube:
+    # dimension -> labels, in coordinate column order; a cell coordinate is
+    # a position in these lists
+    labels: dict[str, list[str]]
+    # (cell, dimension) coordinates of every non-empty cell. The dense
+    # cube would be mostly empty (each team meets one referee a handful
+    # of times), so only occupied cells are stored; at full resolution
+    # that is close to one cell per team_matches row.
+    coords: np.ndarray
+    # (cell, measure) sums
+    values: np.ndarray
+    # coarser cubes over ROLLUPS, precomputed so those panel queries scan
+    # fewer cells than there are matches
+    rollups: tuple["MatchupCube", ...] = ()
+
+    @classmethod
+    def from_team_matches(cls, team_matches: pd.DataFrame) -> "MatchupCube":
+        season = pd.Categorical(team_matches["season"].astype(str))
+        # Team and Opponent share one set of labels
+        teams = pd.Categorical(
+            np.concatenate([
+                team_matches["Team"].astype(str).to_numpy(),
+                team_matches["Opponent"].astype(str).to_numpy(),
+            ])
+        )
+        n = len(team_matches)
+        venue = pd.Categorical(team_matches["Venue"].astype(str), categories=["Home", "Away"])
+        referee = pd.Categorical(
+            team_matches["Referee"].astype(str).where(team_matches["Referee"].notna(), UNKNOWN_REFEREE)
+        )
+
+        labels = {
+            "season": list(season.categories),
+            "Team": list(teams.categories),
+            "Venue": list(venue.categories),
+            "Opponent": list(teams.categories),
+            "Referee": list(referee.categories),
+        }
+        row_coords = np.column_stack([
+            season.codes, teams.codes[:n], venue.codes, teams.codes[n:], referee.codes,
+        ]).astype(np.int32)
+
+        points = team_matches["Points"].to_numpy(dtype=np.int64)
+        row_values = np.column_stack([
+            np.ones(n, dtype=np.int64),
+            points == 3,
+            points == 1,
+            points == 0,
+            *(team_matches[col].fillna(0).to_numpy(dtype=np.int64) for col in SUMMED),
+        ])
+
+        base = cls(labels, *_sum_cells(row_coords, row_values))
+        return cls(labels, base.coords, base.values, tuple(base.rollup(dims) for dims in ROLLUPS))
+
+    @property
+    def dimensions(self) -> list[str]:
+        return list(self.labels)
+
+    def rollup(self, dims: list[str]) -> "MatchupCube":
+        cols = [self.dimensions.index(d) for d in dims]
+        return MatchupCube(
+            {d: self.labels[d] for d in dims},
+            *_sum_cells(self.coords[:, cols], self.values),
+        )
+
+    @cached_property
+    def _lookup(self) -> dict[str, dict[str, int]]:
+        return {dim: {label: i for i, label in enumerate(labels)} for dim, labels in self.labels.items()}
+
+    def _codes(self, dim: str, wanted) -> np.ndarray:
+        if isinstance(wanted, str):
+            wanted = [wanted]
+        lookup = self._lookup[dim]
+        return np.array([lookup[w] for w in wanted if w in lookup], dtype=np.int32)
+
+    def query(
+            self,
+            by: list[str],
+            where: dict[str, str | list[str]] | None = None,
+            measures: list[str] | None = None
+    ) -> pd.DataFrame:
+        # slice on `where`, roll every other dimension up into `by`
+        needed = set(by) | set(where or {})
+        unknown = needed - set(self.dimensions)
+        if unknown:
+            raise KeyError(f"unknown dimensions {sorted(unknown)}; have {self.dimensions}")
+        cube = min(
+            (c for c in (self, *self.rollups) if needed <= set(c.dimensions)),
+            key=lambda c: len(c.coords),
+        )
+        return cube._query(by, where, measures)
+
+    def _query(
+            self,
+            by: list[str],
+            where: dict[str, str | list[str]] | None,
+            measures: list[str] | None
+    ) -> pd.DataFrame:
+        measures = measures or MEASURES
+        cols = [MEASURES.index(m) for m in measures]
+        dims = self.dimensions
+
+        mask = np.ones(len(self.coords), dtype=bool)
+        for dim, wanted in (where or {}).items():
+            mask &= np.isin(self.coords[:, dims.index(dim)], self._codes(dim, wanted))
+        coords = self.coords[mask][:, [dims.index(d) for d in by]]
+        values = self.values[mask][:, cols].astype(np.int64)
+
+        if not by:
+            return pd.DataFrame([values.sum(axis=0)], columns=measures)
+
+        shape = [len(self.labels[d]) for d in by]
+        flat = np.ravel_multi_index(tuple(coords.T), shape)
+        groups, inverse = np.unique(flat, return_inverse=True)
+        sums = np.column_stack([
+            np.bincount(inverse, weights=values[:, j], minlength=len(groups))
+            for j in range(len(cols))
+        ]).astype(np.int64)
+
+        out = {
+            dim: pd.Categorical.from_codes(codes, categories=self.labels[dim])
+            for dim, codes in zip(by, np.unravel_index(groups, shape))
+        }
+        out.update({m: sums[:, j] for j, m in enumerate(measures)})
+        return pd.DataFrame(out)
+
+    def top_teams(self, season: str, k: int = 6) -> list[str]:
+        table = self.query(["Team"], {"season": season}, ["Points", "GF", "GA"])
+        table["GD"] = table["GF"] - table["GA"]
+        table = table.sort_values(["Points", "GD", "GF"], ascending=False)
+        return [str(team) for team in table["Team"].head(k)]
+
+
+def _sum_cells(coords: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # one row per distinct coordinate, values summed
+    cells, inverse = np.unique(coords, axis=0, return_inverse=True)
+    sums = np.zeros((len(cells), values.shape[1]), dtype=np.int64)
+    np.add.at(sums, inverse.ravel(), values)
+    return cells, sums.astype(np.int32)
@@ -0,0 +1,97 @@
+"""
+Declared dtypes for the Datasets frames, plus a memory report
+"""
+
+import pandas as pd
+
+MATCH_STATS = [
+    "FTHG", "FTAG", "HTHG", "HTAG", "HS", "AS", "HST", "AST",
+    "HF", "AF", "HC", "AC", "HY", "AY", "HR", "AR",
+]
+
+# frame -> column -> dtype; integer columns fall back to the nullable
+# variant ("int8" -> "Int8") when the data has gaps
+SCHEMAS = {
+    "matches": {
+        "league": "category",
+        "season": "category",
+        "HomeTeam": "category",
+        "AwayTeam": "category",
+        "Referee": "category",
+        "FTR": "category",
+        "HTR": "category",
+        **{col: "int8" for col in MATCH_STATS},
+        "home_points": "int8",
+        "away_points": "int8",
+        "total_goals": "int8",
+        "goal_diff": "int8",
+        "match_id": "int32",
+    },
+    "team_matches": {
+        "match_id": "int32",
+        "season": "category",
+        "Team": "category",
+        "Opponent": "category",
+        "Referee": "category",
+        "Venue": "category",
+        "GF": "int8",
+        "GA": "int8",
+        "Points": "int8",
+        "Shots": "int8",
+        "SOT": "int8",
+        "Fouls": "int8",
+        "Corners": "int8",
+        "Yellow": "int8",
+        "Red": "int8",
+        "GD": "int8",
+        "Win": "int8",
+    },
+    "team_summary": {
+        "season": "category",
+        "Team": "category",
+        "Points": "int16",
+        "GF": "int16",
+        "GA": "int16",
+        "GD": "int16",
+        "Wins": "int16",
+        "Matches": "int16",
+    },
+    "home_away_points": {
+        "season": "category",
+        "Team": "category",
+        "Venue": "category",
+        "Points": "int16",
+    },
+    "delta_points": {
+        "Team": "category",
+        "delta_points": "Int16",
+        "Direction": "category",
+    },
+}
+
+
+def apply_schema(df: pd.DataFrame, frame: str) -> pd.DataFrame:
+    casts = {}
+    for col, dtype in SCHEMAS[frame].items():
+        if col not in df.columns:
+            continue
+        if dtype.startswith("int") and df[col].isna().any():
+            dtype = dtype.capitalize()
+        if df[col].dtype != dtype:
+            casts[col] = dtype
+    return df.astype(casts) if casts else df
+
+
+def memory_report(datasets) -> pd.DataFrame:
+    rows = []
+    for name in SCHEMAS:
+        df = getattr(datasets, name)
+        rows.append({
+            "frame": name,
+            "rows": len(df),
+            "columns": df.shape[1],
+            "bytes": int(df.memory_usage(deep=True).sum()),
+        })
+    report = pd.DataFrame(rows)
+    report["MB"] = report["bytes"] / 2**20
+    return report
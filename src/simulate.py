@@ -0,0 +1,205 @@
+"""
+Monte Carlo expected points: Poisson goals from per-team attack/defence
+rates, simulated for every fixture of a season at once
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .compare import compare_pair
+
+# share of a team's rate taken from shots on target (times the league's
+# conversion rate) rather than goals; shots are the less lucky signal
+SOT_WEIGHT = 0.5
+
+# simulations per vectorized block: a block's (sims, matches) uniforms stay
+# around 15 MB for a 380-match season
+CHUNK = 10_000
+
+# goals per side are capped here; P(more) is under 1e-5 for rates up to 4
+MAX_GOALS = 16
+
+# simulations behind the swing chart the app and the static export show
+SWING_SIMS = 20_000
+
+
+@dataclass(frozen=True)
+class SeasonModel:
+    teams: list[str]
+    # (match,) team codes of each fixture
+    home: np.ndarray
+    away: np.ndarray
+    # (match,) expected goals for each side
+    home_rate: np.ndarray
+    away_rate: np.ndarray
+
+    @classmethod
+    def from_team_matches(
+            cls,
+            games: pd.DataFrame,
+            sot_weight: float = SOT_WEIGHT
+    ) -> "SeasonModel":
+        # games: one season of team_matches (a row per team per match)
+        team = pd.Categorical(games["Team"].astype(str))
+        opponent = pd.Categorical(games["Opponent"].astype(str), categories=team.categories)
+        n_teams = len(team.categories)
+
+        gf = games["GF"].to_numpy(dtype=float)
+        sot = games["SOT"].to_numpy(dtype=float, na_value=np.nan)
+        played = np.bincount(team.codes, minlength=n_teams)
+
+        scored = np.bincount(team.codes, weights=gf, minlength=n_teams)
+        conceded = np.bincount(opponent.codes, weights=gf, minlength=n_teams)
+        if sot_weight and not np.isnan(sot).any() and sot.sum() > 0:
+            conversion = gf.sum() / sot.sum()
+            shots_for = np.bincount(team.codes, weights=sot, minlength=n_teams) * conversion
+            shots_against = np.bincount(opponent.codes, weights=sot, minlength=n_teams) * conversion
+            scored = (1 - sot_weight) * scored + sot_weight * shots_for
+            conceded = (1 - sot_weight) * conceded + sot_weight * shots_against
+
+        mean_goals = gf.sum() / len(gf)
+        attack = scored / played / mean_goals
+        defence = conceded / played / mean_goals
+
+        fixtures = (games["Venue"] == "Home").to_numpy()
+        home, away = team.codes[fixtures], opponent.codes[fixtures]
+        home_goals = gf[fixtures].mean()
+        away_goals = games.loc[~fixtures, "GF"].to_numpy(dtype=float).mean()
+        return cls(
+            list(team.categories),
+            home,
+            away,
+            home_goals * attack[home] * defence[away],
+            away_goals * attack[away] * defence[home],
+        )
+
+    def simulate(self, rng: np.random.Generator, n_sims: int) -> np.ndarray:
+        # (sim, team) season points
+        n_matches, n_teams = len(self.home), len(self.teams)
+        margin = (
+            _draw_goals(rng, self.home_rate, n_sims) - _draw_goals(rng, self.away_rate, n_sims)
+        )
+        draws = (margin == 0).astype(np.float32)
+        home_points = 3 * (margin > 0) + draws
+        away_points = 3 * (margin < 0) + draws
+
+        # fixture -> team incidence, so the per-team totals are two matmuls
+        home_of = np.zeros((n_matches, n_teams), dtype=np.float32)
+        away_of = np.zeros((n_matches, n_teams), dtype=np.float32)
+        home_of[np.arange(n_matches), self.home] = 1
+        away_of[np.arange(n_matches), self.away] = 1
+        return (home_points @ home_of + away_points @ away_of).astype(np.int32)
+
+
+def _draw_goals(rng: np.random.Generator, rate: np.ndarray, n_sims: int) -> np.ndarray:
+    # Inverse-CDF Poisson draws: one float32 uniform per (sim, match) and
+    # MAX_GOALS comparisons, several times faster than rng.poisson here
+    k = np.arange(MAX_GOALS)
+    pmf = np.exp(-rate[:, None]) * rate[:, None] ** k / np.cumprod(np.r_[1, k[1:]])
+    cdf = np.cumsum(pmf, axis=1).astype(np.float32)
+
+    u = rng.random((n_sims, len(rate)), dtype=np.float32)
+    goals = np.zeros(u.shape, dtype=np.int8)
+    for j in range(MAX_GOALS):
+        goals += u > cdf[:, j]
+    return goals
+
+
+def _simulate_block(
+        prev: SeasonModel,
+        curr: SeasonModel,
+        paired: tuple[np.ndarray, np.ndarray],
+        span: int,
+        n_sims: int,
+        seed: np.random.SeedSequence
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # returns points totals for both seasons and, for teams in both, a
+    # histogram of simulated swings (integer points, offset by span)
+    rng = np.random.default_rng(seed)
+    points_prev = prev.simulate(rng, n_sims)
+    points_curr = curr.simulate(rng, n_sims)
+    prev_idx, curr_idx = paired
+
+    swing = points_curr[:, curr_idx] - points_prev[:, prev_idx] + span
+    width = 2 * span + 1
+    flat = (swing + np.arange(len(prev_idx)) * width).ravel()
+    hist = np.bincount(flat, minlength=len(prev_idx) * width).reshape(len(prev_idx), width)
+    return points_prev.sum(axis=0, dtype=np.int64), points_curr.sum(axis=0, dtype=np.int64), hist
+
+
+def _quantile(hist: np.ndarray, span: int, q: float) -> np.ndarray:
+    cdf = np.cumsum(hist, axis=1) / hist.sum(axis=1, keepdims=True)
+    return (cdf < q).sum(axis=1) - span
+
+
+def expected_swings(
+        team_matches: pd.DataFrame,
+        seasons: list[str] | None = None,
+        n_sims: int = 100_000,
+        workers: int | None = 1,
+        seed: int = 0
+) -> pd.DataFrame:
+    # Expected points and a simulated swing distribution per team for the
+    # season pair. workers > 1 (or None for every core) spreads the blocks
+    # across processes; each block has its own spawned seed, so results do
+    # not depend on the worker count.
+    seasons = seasons or compare_pair(team_matches["season"].astype(str).unique())
+    prev_season, curr_season = seasons
+    by_season = {
+        season: games for season, games in team_matches.groupby("season", observed=True)
+    }
+    prev = SeasonModel.from_team_matches(by_season[prev_season])
+    curr = SeasonModel.from_team_matches(by_season[curr_season])
+
+    both = sorted(set(prev.teams) & set(curr.teams))
+    paired = (
+        np.array([prev.teams.index(t) for t in both], dtype=np.intp),
+        np.array([curr.teams.index(t) for t in both], dtype=np.intp),
+    )
+    # most points a team can swing by: 3 per game of the longer season
+    span = 3 * max(2 * len(prev.home) // len(prev.teams), 2 * len(curr.home) // len(curr.teams))
+
+    sizes = [CHUNK] * (n_sims // CHUNK) + ([n_sims % CHUNK] if n_sims % CHUNK else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(prev, curr, paired, span, size, s) for size, s in zip(sizes, seeds)]
+
+    if workers == 1 or len(sizes) == 1:
+        blocks = [_simulate_block(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(sizes))) as pool:
+            blocks = list(pool.map(_simulate_block, *zip(*args)))
+
+    sum_prev = sum(b[0] for b in blocks)
+    sum_curr = sum(b[1] for b in blocks)
+    hist = sum(b[2] for b in blocks)
+
+    actual = (
+        team_matches.loc[team_matches["season"].isin(seasons)]
+        .groupby(["season", "Team"], observed=True)["Points"].sum()
+        .astype(np.int64)
+    )
+    xpts_prev = pd.Series(sum_prev / n_sims, index=prev.teams)
+    xpts_curr = pd.Series(sum_curr / n_sims, index=curr.teams)
+
+    out = pd.DataFrame({
+        "Team": both,
+        "points_prev": actual.loc[prev_season].reindex(both).to_numpy(),
+        "points_curr": actual.loc[curr_season].reindex(both).to_numpy(),
+        "xpts_prev": xpts_prev.reindex(both).to_numpy(),
+        "xpts_curr": xpts_curr.reindex(both).to_numpy(),
+    })
+    out["delta"] = out["points_curr"] - out["points_prev"]
+    out["xdelta"] = out["xpts_curr"] - out["xpts_prev"]
+    # positive luck: the real swing beat what the underlying rates predict
+    out["luck"] = out["delta"] - out["xdelta"]
+    out["swing_p05"] = _quantile(hist, span, 0.05)
+    out["swing_p50"] = _quantile(hist, span, 0.5)
+    out["swing_p95"] = _quantile(hist, span, 0.95)
+    # share of simulated swings at or below the real one
+    below = np.cumsum(hist, axis=1)[np.arange(len(both)), out["delta"].to_numpy() + span]
+    out["swing_pct"] = below / n_sims
+    return out.sort_values("delta", ascending=False, ignore_index=True)
@@ -0,0 +1,135 @@
+"""
+Process-wide, read-only dataset store, loaded and hot-reloaded off the
+request path
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from .cache import cache_key, load_cached_datasets, read_latest_cache
+from .constants import DEFAULT_LEAGUE
+from .data import Datasets
+from .simulate import SWING_SIMS, expected_swings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    datasets: Datasets
+    # cache key of the source files the snapshot was built from
+    source_key: str
+    loaded_at: float
+    # expected_swings over datasets.compare_seasons, simulated with the load
+    swings: pd.DataFrame
+
+    @property
+    def version(self) -> str:
+        return self.datasets.version
+
+
+class DatasetStore:
+    # One instance per process (the app keeps it in st.cache_resource).
+    # Readers take a snapshot and keep it for the whole rerun; loads run on
+    # the watcher thread and swap the reference when done, so a rerun never
+    # waits on ingest once any snapshot exists, and in-flight sessions are
+    # never mutated under.
+
+    def __init__(
+            self,
+            data_dir: Path | None = None,
+            league: str | None = DEFAULT_LEAGUE,
+            poll_interval: float = 5.0,
+            cache_dir: Path | None = None,
+            n_sims: int = SWING_SIMS
+    ):
+        self.data_dir = data_dir
+        self.league = league
+        self.poll_interval = poll_interval
+        self.cache_dir = cache_dir
+        self.n_sims = n_sims
+        self.refreshing = False
+        # the watcher's most recent failure, cleared by the next good load
+        self.last_error: Exception | None = None
+        self._snapshot: Snapshot | None = None
+        self._ready = threading.Event()
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: threading.Thread | None = None
+
+    @property
+    def current(self) -> Snapshot:
+        # blocking accessor for scripts; the app uses wait(timeout)
+        if self._snapshot is None:
+            self.reload()
+        return self._snapshot
+
+    def wait(self, timeout: float | None = None) -> Snapshot | None:
+        self._ready.wait(timeout)
+        return self._snapshot
+
+    def _publish(self, datasets: Datasets, key: str) -> None:
+        # everything a rerun reads is built here, on the loading thread
+        datasets.prime()
+        swings = expected_swings(
+            datasets.team_matches, datasets.compare_seasons, n_sims=self.n_sims
+        )
+        self._snapshot = Snapshot(datasets, key, time.time(), swings)
+        self._ready.set()
+
+    def reload(self, force: bool = False) -> bool:
+        # returns True when a new snapshot was swapped in
+        with self._reload_lock:
+            key = cache_key(self.data_dir, self.league)
+            if not force and self._snapshot is not None and self._snapshot.source_key == key:
+                return False
+            self.refreshing = True
+            try:
+                datasets = load_cached_datasets(self.data_dir, self.league, self.cache_dir)
+                self._publish(datasets, key)
+            finally:
+                self.refreshing = False
+            return True
+
+    def _load_last_good(self) -> None:
+        # serve the previous process's build while the current files load
+        found = read_latest_cache(self.data_dir, self.league, self.cache_dir)
+        if found is not None and self._snapshot is None:
+            key, datasets = found
+            self._publish(datasets, key)
+
+    def _watch(self) -> None:
+        try:
+            self._load_last_good()
+        except Exception:
+            logger.exception("could not read the last cached build")
+        while True:
+            try:
+                self.reload()
+            except Exception as exc:
+                # e.g. a half-written CSV; keep serving the last good snapshot
+                # and retry on the next poll, logging each new failure once
+                if repr(exc) != repr(self.last_error):
+                    logger.exception("reloading %s failed", self.league or "all leagues")
+                self.last_error = exc
+            else:
+                self.last_error = None
+            if self._stop.wait(self.poll_interval):
+                return
+
+    def start(self) -> "DatasetStore":
+        if self._watcher is None or not self._watcher.is_alive():
+            self._stop.clear()
+            self._watcher = threading.Thread(
+                target=self._watch, name="dataset-store-watcher", daemon=True
+            )
+            self._watcher.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
@@ -0,0 +1,109 @@
+"""
+Chunked ingestion for archives too large to load whole: folds each chunk
+into running team_summary / home_away_points aggregates
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .constants import DEFAULT_LEAGUE
+from .data import SeasonFile, discover_season_files
+from .schema import apply_schema
+
+# the only columns the aggregates need; everything else (odds, stats) is skipped
+AGGREGATE_COLUMNS = ["HomeTeam", "AwayTeam", "FTHG", "FTAG", "FTR"]
+AGGREGATE_DTYPES = {
+    "HomeTeam": "category",
+    "AwayTeam": "category",
+    "FTHG": "float32",
+    "FTAG": "float32",
+    "FTR": "category",
+}
+
+KEYS = ["season", "Team", "Venue"]
+TOTALS = ["Points", "GF", "GA", "Wins", "Matches"]
+
+
+def _chunk_totals(chunk: pd.DataFrame) -> pd.DataFrame:
+    chunk = chunk.dropna(subset=["FTR", "FTHG", "FTAG"])
+    result = chunk["FTR"].astype(str).to_numpy()
+    draw = result == "D"
+
+    sides = []
+    for venue, team, opponent, gf, ga, won in [
+        ("Home", "HomeTeam", "AwayTeam", "FTHG", "FTAG", "H"),
+        ("Away", "AwayTeam", "HomeTeam", "FTAG", "FTHG", "A"),
+    ]:
+        win = result == won
+        sides.append(pd.DataFrame({
+            "season": chunk["season"].to_numpy(),
+            "Team": chunk[team].astype(str).to_numpy(),
+            "Venue": venue,
+            "Points": np.where(win, 3, np.where(draw, 1, 0)),
+            "GF": chunk[gf].to_numpy(),
+            "GA": chunk[ga].to_numpy(),
+            "Wins": win.astype(np.int64),
+            "Matches": 1,
+        }))
+
+    return pd.concat(sides, ignore_index=True).groupby(KEYS, sort=False)[TOTALS].sum()
+
+
+def _iter_chunks(
+        path: Path,
+        season: str | None,
+        season_column: str | None,
+        chunksize: int
+):
+    usecols = AGGREGATE_COLUMNS + ([season_column] if season_column else [])
+    reader = pd.read_csv(
+        path,
+        usecols=usecols,
+        dtype=AGGREGATE_DTYPES,
+        chunksize=chunksize,
+    )
+    for chunk in reader:
+        chunk["season"] = chunk[season_column].astype(str) if season_column else season
+        yield chunk
+
+
+def stream_aggregates(
+        files: list[SeasonFile | Path] | None = None,
+        chunksize: int = 200_000,
+        season_column: str | None = None,
+        data_dir: Path | None = None,
+        league: str | None = DEFAULT_LEAGUE
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    # Archives that hold many seasons in one file name the column carrying
+    # the season label via season_column; per-season files take it from
+    # their file name. Peak memory is one chunk plus the running totals.
+    if files is None:
+        files = discover_season_files(data_dir, league)
+
+    totals = None
+    for f in files:
+        path, season = (f.path, f.season) if isinstance(f, SeasonFile) else (Path(f), None)
+        if season is None and season_column is None:
+            raise ValueError(f"{path.name}: no season in the file name; pass season_column")
+
+        for chunk in _iter_chunks(path, season, season_column, chunksize):
+            part = _chunk_totals(chunk)
+            totals = part if totals is None else totals.add(part, fill_value=0)
+
+    if totals is None:
+        raise FileNotFoundError("no input files to stream")
+
+    totals = totals.sort_index().reset_index()
+
+    team_summary = totals.groupby(["season", "Team"], as_index=False)[TOTALS].sum()
+    team_summary["GD"] = team_summary["GF"] - team_summary["GA"]
+    team_summary = team_summary[["season", "Team", "Points", "GF", "GA", "GD", "Wins", "Matches"]]
+
+    home_away_points = totals[["season", "Team", "Venue", "Points"]]
+
+    return (
+        apply_schema(team_summary, "team_summary"),
+        apply_schema(home_away_points, "home_away_points"),
+    )
@@ -0,0 +1,86 @@
+"""
+League table at any date: per-season cumulative aggregates snapshotted on
+every match date, looked up with one binary search
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# stats accumulated per team; GD and Lost are derived
+STATS = ["Played", "Won", "Drawn", "GF", "GA", "Points"]
+TABLE_COLUMNS = ["Pos", "Team", "Played", "Won", "Drawn", "Lost", "GF", "GA", "GD", "Points"]
+
+
+@dataclass(frozen=True)
+class SeasonSnapshots:
+    teams: list[str]
+    # sorted unique match dates, int64 ns
+    dates: np.ndarray
+    # (date, team, stat): totals after all matches on or before dates[i]
+    totals: np.ndarray
+
+
+class LeagueTable:
+    def __init__(self, snapshots: dict[str, SeasonSnapshots]):
+        self.snapshots = snapshots
+
+    @classmethod
+    def from_team_matches(cls, team_matches: pd.DataFrame) -> "LeagueTable":
+        snapshots = {}
+        for season, games in team_matches.groupby("season", observed=True, sort=True):
+            team = pd.Categorical(games["Team"].astype(str))
+            when = games["Date"].to_numpy().astype("datetime64[ns]").view(np.int64)
+            dates, day = np.unique(when, return_inverse=True)
+
+            points = games["Points"].to_numpy().astype(np.int64)
+            values = np.column_stack([
+                np.ones(len(games), dtype=np.int64),
+                points == 3,
+                points == 1,
+                games["GF"].to_numpy(),
+                games["GA"].to_numpy(),
+                points,
+            ]).astype(np.int64)
+
+            totals = np.zeros((len(dates), len(team.categories), len(STATS)), dtype=np.int64)
+            np.add.at(totals, (day, team.codes), values)
+            snapshots[str(season)] = SeasonSnapshots(
+                list(team.categories), dates, np.cumsum(totals, axis=0)
+            )
+        return cls(snapshots)
+
+    @property
+    def seasons(self) -> list[str]:
+        return list(self.snapshots)
+
+    def date_range(self, season: str) -> tuple[pd.Timestamp, pd.Timestamp]:
+        dates = self.snapshots[season].dates
+        return pd.Timestamp(dates[0]), pd.Timestamp(dates[-1])
+
+    def at(self, season: str, date) -> pd.DataFrame:
+        snap = self.snapshots[season]
+        i = np.searchsorted(snap.dates, pd.Timestamp(date).as_unit("ns").value, side="right")
+        totals = snap.totals[i - 1] if i else np.zeros_like(snap.totals[0])
+        played, won, drawn, gf, ga, points = totals.T
+        gd = gf - ga
+
+        # Premier League order: points, goal difference, goals scored, wins;
+        # the name only makes the order total
+        names = np.arange(len(snap.teams))
+        order = np.lexsort((names, -won, -gf, -gd, -points))
+
+        table = pd.DataFrame({
+            "Team": np.asarray(snap.teams)[order],
+            "Played": played[order],
+            "Won": won[order],
+            "Drawn": drawn[order],
+            "Lost": (played - won - drawn)[order],
+            "GF": gf[order],
+            "GA": ga[order],
+            "GD": gd[order],
+            "Points": points[order],
+        })
+        table.insert(0, "Pos", np.arange(1, len(table) + 1))
+        return table
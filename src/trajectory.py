@@ -0,0 +1,99 @@
+"""
+Cumulative points after every matchday, precomputed as a (season, team, matchday) array
+"""
+
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+# padding for matchdays past a team's last match
+_END = np.iinfo(np.int64).max
+
+
+@dataclass(frozen=True)
+class PointsTrajectory:
+    seasons: list[str]
+    teams: list[str]
+    # (season, team, matchday + 1): points after k matches, index 0 is the
+    # start of the season; rows past a team's last match repeat its total;
+    # NaN where the team was not in the league that season
+    cumulative: np.ndarray
+    # (season, team, matchday): date of each team's k-th match as int64 ns,
+    # padded with _END
+    dates: np.ndarray
+
+    @classmethod
+    def from_team_matches(cls, team_matches: pd.DataFrame) -> "PointsTrajectory":
+        season = pd.Categorical(team_matches["season"].astype(str))
+        team = pd.Categorical(team_matches["Team"].astype(str))
+        date = team_matches["Date"].to_numpy().astype("datetime64[ns]").view(np.int64)
+        points = team_matches["Points"].to_numpy().astype(np.int64)
+
+        # one sort, then position-in-group and running totals from flat cumsums
+        order = np.lexsort((date, team.codes, season.codes))
+        s, t, d, p = season.codes[order], team.codes[order], date[order], points[order]
+        group = s.astype(np.int64) * len(team.categories) + t
+        starts = np.r_[0, np.flatnonzero(np.diff(group)) + 1]
+        sizes = np.diff(np.r_[starts, len(group)])
+        matchday = np.arange(len(group)) - np.repeat(starts, sizes)
+        running = np.cumsum(p)
+        cum = running - np.repeat(running[starts] - p[starts], sizes)
+
+        n_matchdays = int(matchday.max()) + 1 if len(matchday) else 0
+        shape = (len(season.categories), len(team.categories))
+        cumulative = np.full((*shape, n_matchdays + 1), np.nan)
+        cumulative[s[starts], t[starts], 0] = 0.0
+        cumulative[s, t, matchday + 1] = cum
+        cumulative = np.fmax.accumulate(cumulative, axis=2)  # carry totals forward
+
+        dates = np.full((*shape, n_matchdays), _END, dtype=np.int64)
+        dates[s, t, matchday] = d
+
+        return cls(list(season.categories), list(team.categories), cumulative, dates)
+
+    @property
+    def n_matchdays(self) -> int:
+        return self.cumulative.shape[2] - 1
+
+    @cached_property
+    def _season_pos(self) -> dict[str, int]:
+        return {season: i for i, season in enumerate(self.seasons)}
+
+    @cached_property
+    def _team_pos(self) -> dict[str, int]:
+        return {team: i for i, team in enumerate(self.teams)}
+
+    def _si(self, season: str) -> int:
+        return self._season_pos[season]
+
+    def points_after(self, season: str, team: str, matchday: int) -> float:
+        k = min(max(matchday, 0), self.n_matchdays)
+        return float(self.cumulative[self._si(season), self._team_pos[team], k])
+
+    def table_after(self, season: str, matchday: int) -> pd.Series:
+        k = min(max(matchday, 0), self.n_matchdays)
+        points = pd.Series(self.cumulative[self._si(season), :, k], index=self.teams, name="Points")
+        return points.dropna().sort_values(ascending=False, kind="stable")
+
+    def team_frame(self, team: str, seasons: list[str] | None = None) -> pd.DataFrame:
+        ti = self._team_pos[team]
+        frames = []
+        for season in seasons or self.seasons:
+            points = self.cumulative[self._si(season), ti]
+            if np.isnan(points[0]):
+                continue
+            played = int((self.dates[self._si(season), ti] != _END).sum())
+            frames.append(pd.DataFrame({
+                "season": season,
+                "Matchday": np.arange(played + 1),
+                "Points": points[:played + 1],
+            }))
+        if not frames:
+            return pd.DataFrame(columns=["season", "Matchday", "Points"])
+        return pd.concat(frames, ignore_index=True)
+
+    def delta_trajectory(self, team: str, prev_season: str, curr_season: str) -> np.ndarray:
+        ti = self._team_pos[team]
+        return self.cumulative[self._si(curr_season), ti] - self.cumulative[self._si(prev_season), ti]
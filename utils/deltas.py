@@ -2,47 +2,71 @@
 New to the Story - Deltas
 """
 
-import numpy as np
 import pandas as pd
 
-from src.constants import SEASON_ORDER
+from src.data import Datasets
+from src.instrument import instrumented
 
+TEAM_DELTA_COLUMNS = ["points_prev", "points_curr", "delta"]
+HOME_AWAY_COLUMNS = [
+    "home_prev", "home_curr", "away_prev", "away_curr",
+    "home_change", "away_change", "total_change", "driver",
+]
 
-def team_delta(team_summary: pd.DataFrame, team: str) -> tuple[float, float, float]:
-    t = team_summary.loc[team_summary["Team"] == team, ["season", "Points"]].copy()
-    points = t.set_index("season")["Points"]
-    p2324 = float(points.get("2023-24", np.nan))
-    p2425 = float(points.get("2024-25", np.nan))
-    return p2324, p2425, p2425 - p2324
 
+def _team_row(datasets: Datasets, team: str, columns: list[str]) -> pd.Series:
+    deltas = datasets.season_deltas
+    if team not in deltas.index:
+        # not in either compared season
+        return pd.Series(float("nan"), index=columns, dtype=object)
+    return deltas.loc[team, columns]
 
-def home_away_delta(home_away_points: pd.DataFrame, team: str) -> dict:
-    t = home_away_points.loc[home_away_points["Team"] == team].copy()
-    wide = t.pivot(index="season", columns="Venue", values="Points").reindex(SEASON_ORDER)
 
-    home_23 = float(wide.loc["2023-24", "Home"])
-    home_24 = float(wide.loc["2024-25", "Home"])
-    away_23 = float(wide.loc["2023-24", "Away"])
-    away_24 = float(wide.loc["2024-25", "Away"])
+def _season_deltas(datasets: Datasets, seasons: list[str] | None) -> pd.DataFrame:
+    # the cached frame for compare_seasons, else compared on demand
+    if seasons is None or list(seasons) == datasets.compare_seasons:
+        return datasets.season_deltas
+    return datasets.points_cube.compare_by_team(*seasons)
 
-    home_change = home_24 - home_23
-    away_change = away_24 - away_23
-    total_change = home_change + away_change
 
-    if abs(home_change - away_change) <= 3:
-        driver = "balanced"
-    elif abs(home_change) > abs(away_change):
-        driver = "home-driven"
-    else:
-        driver = "away-driven"
+@instrumented()
+def team_deltas(
+        datasets: Datasets,
+        seasons: list[str] | None = None
+) -> pd.DataFrame:
+    return _season_deltas(datasets, seasons)[TEAM_DELTA_COLUMNS]
 
+
+@instrumented()
+def home_away_deltas(
+        datasets: Datasets,
+        seasons: list[str] | None = None
+) -> pd.DataFrame:
+    return _season_deltas(datasets, seasons)[HOME_AWAY_COLUMNS]
+
+
+@instrumented()
+def team_delta(
+        datasets: Datasets,
+        team: str
+) -> tuple[float, float, float]:
+    row = _team_row(datasets, team, TEAM_DELTA_COLUMNS)
+    return float(row["points_prev"]), float(row["points_curr"]), float(row["delta"])
+
+
+@instrumented()
+def home_away_delta(
+        datasets: Datasets,
+        team: str
+) -> dict:
+    row = _team_row(datasets, team, HOME_AWAY_COLUMNS)
     return {
-        "home_23": home_23,
-        "home_24": home_24,
-        "away_23": away_23,
-        "away_24": away_24,
-        "home_change": home_change,
-        "away_change": away_change,
-        "total_change": total_change,
-        "driver": driver,
-    }
\ No newline at end of file
+        "home_prev": float(row["home_prev"]),
+        "home_curr": float(row["home_curr"]),
+        "away_prev": float(row["away_prev"]),
+        "away_curr": float(row["away_curr"]),
+        "home_change": float(row["home_change"]),
+        "away_change": float(row["away_change"]),
+        "total_change": float(row["total_change"]),
+        "driver": row["driver"] if isinstance(row["driver"], str) else "incomplete",
+    }
@@ -0,0 +1,240 @@
+"""
+Static export: every team's Vega-Lite specs and narrative prerendered to a
+directory that any static host or CDN can serve
+
+    python -m utils.export --out-dir site/     # site/index.html, teams/, data/
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+from functools import partial
+from pathlib import Path
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+from src.cache import load_cached_datasets
+from src.chart_data import (
+    delta_data,
+    home_away_data,
+    match_data,
+    points_data,
+    swing_data,
+    trajectory_data,
+)
+from src.charts import (
+    chart_delta_points,
+    chart_home_away_points,
+    chart_match_scatter,
+    chart_points_by_team,
+    chart_points_trajectory,
+    chart_swing_range,
+)
+from src.constants import DEFAULT_LEAGUE
+from src.data import Datasets
+from src.simulate import SWING_SIMS, expected_swings
+
+from .nums_to_words import pace_sentence, swing_sentence
+from .story import map_teams, team_story
+
+EXPORT_DIR = Path(__file__).resolve().parents[1] / "site"
+
+VEGA_SCRIPTS = [
+    "https://cdn.jsdelivr.net/npm/vega@6",
+    "https://cdn.jsdelivr.net/npm/vega-lite@6",
+    "https://cdn.jsdelivr.net/npm/vega-embed@7",
+]
+
+PAGE = """<!doctype html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+{scripts}
+<style>body{{font-family:sans-serif;max-width:1200px;margin:2rem auto;padding:0 1rem}}
+.chart{{width:100%;margin:1.5rem 0}}</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+def slugify(team: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", team.lower()).strip("-")
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    # workers race on shared data files; same name means same content
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+
+def static_spec(chart: alt.TopLevelMixin, out_dir: Path) -> dict:
+    # Like chart_spec, but the rows go to data/<content hash>.json and the
+    # spec points at that URL. Frames shared by every team (the league-wide
+    # charts) hash the same, so they are written and downloaded once.
+    df = chart.data
+    if not isinstance(df, pd.DataFrame):
+        return chart.to_dict()
+
+    rows = df.to_json(orient="records", date_format="iso")
+    name = f"{hashlib.sha1(rows.encode()).hexdigest()[:16]}.json"
+    path = out_dir / "data" / name
+    if not path.exists():
+        _write_atomic(path, rows)
+
+    chart = chart.copy(deep=False)
+    chart.data = alt.UrlData(url=f"../data/{name}", format=alt.DataFormat(type="json"))
+    return chart.to_dict()
+
+
+def team_charts(datasets: Datasets, swings: pd.DataFrame, team: str) -> dict[str, alt.TopLevelMixin]:
+    index = datasets.team_index
+    seasons = datasets.compare_seasons
+    return {
+        "delta": chart_delta_points(delta_data(datasets.ranked_deltas, seasons), team),
+        "swing": chart_swing_range(swing_data(swings), team),
+        "points": chart_points_by_team(points_data(datasets.team_summary, seasons), team),
+        "trajectory": chart_points_trajectory(
+            trajectory_data(datasets.trajectory, team, seasons), team
+        ),
+        "home_away": chart_home_away_points(
+            home_away_data(datasets.home_away_points, seasons), team
+        ),
+        "matches": chart_match_scatter(
+            match_data(datasets.team_matches, team, index["team_matches"], seasons), team
+        ),
+    }
+
+
+def narrative(
+        story: dict,
+        swing: dict | None,
+        gap: np.ndarray,
+        seasons: list[str]
+) -> list[str]:
+    # the app's sentences, as plain text
+    team = story["team"]
+    prev_season, curr_season = seasons
+    points, driver = story["points"], story["home_away"]
+    lines = [
+        f"{team} moved from {points['prev']:.0f} points in {prev_season} to "
+        f"{points['curr']:.0f} in {curr_season} ({points['delta']:+.0f}). {story['movement']}",
+    ]
+    if swing is not None:
+        lines.append(swing_sentence(team, swing["xdelta"], swing["swing_pct"]))
+    pace = pace_sentence(team, gap, prev_season)
+    if pace is not None:
+        lines.append(pace)
+    lines.append(
+        f"Home points changed by {driver['home_change']:+.0f} and away points by "
+        f"{driver['away_change']:+.0f}; overall this swing was {driver['driver']}."
+    )
+    return lines
+
+
+def render_page(
+        team: str,
+        seasons: list[str],
+        lines: list[str],
+        callouts: list[str],
+        specs: dict[str, dict]
+) -> str:
+    prev_season, curr_season = seasons
+    body = [
+        '<p><a href="../index.html">All teams</a></p>',
+        f"<h1>{html.escape(team)}: {prev_season} to {curr_season}</h1>",
+        *(f"<p>{html.escape(line)}</p>" for line in lines),
+    ]
+    if callouts:
+        body.append("<ul>" + "".join(f"<li>{html.escape(c)}</li>" for c in callouts) + "</ul>")
+    body += [f'<div class="chart" id="chart-{name}"></div>' for name in specs]
+    # "</" inside a script block would end it early
+    payload = json.dumps(specs, separators=(",", ":")).replace("</", "<\\/")
+    body.append(
+        f"<script>const specs = {payload};\n"
+        "for (const [name, spec] of Object.entries(specs)) "
+        "vegaEmbed(`#chart-${name}`, spec, {actions: false});</script>"
+    )
+    return PAGE.format(
+        title=html.escape(f"{team} - Premier League Story"),
+        scripts="\n".join(f'<script src="{src}"></script>' for src in VEGA_SCRIPTS),
+        body="\n".join(body),
+    )
+
+
+def export_team(datasets: Datasets, team: str, swings: pd.DataFrame, out_dir: Path) -> dict:
+    story = team_story(datasets, team)
+    swing = swings.loc[swings["Team"] == team]
+    seasons = datasets.compare_seasons
+    gap = datasets.trajectory.delta_trajectory(team, *seasons)
+    lines = narrative(story, swing.iloc[0].to_dict() if len(swing) else None, gap, seasons)
+    specs = {
+        name: static_spec(chart, out_dir)
+        for name, chart in team_charts(datasets, swings, team).items()
+    }
+
+    slug = slugify(team)
+    bundle = {"story": story, "narrative": lines, "specs": specs}
+    _write_atomic(out_dir / "teams" / f"{slug}.json", json.dumps(bundle, separators=(",", ":")))
+    _write_atomic(out_dir / "teams" / f"{slug}.html", render_page(team, seasons, lines, story["callouts"], specs))
+    return {"team": team, "page": f"teams/{slug}.html", "bundle": f"teams/{slug}.json"}
+
+
+def export_site(
+        out_dir: Path | None = None,
+        data_dir: Path | None = None,
+        league: str | None = DEFAULT_LEAGUE,
+        workers: int | None = None,
+        n_sims: int = SWING_SIMS
+) -> Path:
+    out_dir = Path(out_dir or EXPORT_DIR)
+    (out_dir / "data").mkdir(parents=True, exist_ok=True)
+    (out_dir / "teams").mkdir(exist_ok=True)
+
+    datasets = load_cached_datasets(data_dir, league)  # also warms the cache for workers
+    swings = expected_swings(datasets.team_matches, datasets.compare_seasons, n_sims=n_sims)
+    teams = datasets.delta_points.dropna(subset=["delta_points"])["Team"].astype(str).tolist()
+
+    export = partial(export_team, swings=swings, out_dir=out_dir)
+    pages = map_teams(export, sorted(teams), data_dir, league, workers)
+
+    prev_season, curr_season = datasets.compare_seasons
+    links = "".join(
+        f'<li><a href="{p["page"]}">{html.escape(p["team"])}</a></li>' for p in pages
+    )
+    _write_atomic(out_dir / "index.html", PAGE.format(
+        title="Premier League Story",
+        scripts="",
+        body=f"<h1>Who rose and who fell from {prev_season} to {curr_season}?</h1><ul>{links}</ul>",
+    ))
+    _write_atomic(
+        out_dir / "bundle.json",
+        json.dumps({"version": datasets.version, "teams": pages}, separators=(",", ":")),
+    )
+    return out_dir
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prerender every team's story to a static site")
+    parser.add_argument("--data-dir", type=Path)
+    parser.add_argument("--league", default=DEFAULT_LEAGUE)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--sims", type=int, default=SWING_SIMS, help="expected-points simulations")
+    parser.add_argument("--out-dir", type=Path, help=f"default: {EXPORT_DIR}")
+    args = parser.parse_args()
+
+    out_dir = export_site(args.out_dir, args.data_dir, args.league, args.workers, args.sims)
+    print(f"wrote the static site to {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
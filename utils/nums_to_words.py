@@ -2,8 +2,22 @@
 Explaining Numbers in Sentences
 """
 
+import numpy as np
 import pandas as pd
 
+from src.instrument import instrumented
+
+CALLOUT_COLUMNS = ["Date", "Venue", "Opponent", "GF", "GA", "GD", "Points"]
+
+# callout buckets in priority order: (name, row filter, lexicographic keys);
+# each key is (column, ascending) and the first row under the keys wins.
+# Filters work on both column arrays and DataFrames.
+CALLOUT_BUCKETS = [
+    ("win", lambda d: d["Points"] == 3, [("GD", False), ("GF", False), ("Date", True)]),
+    ("loss", lambda d: d["Points"] == 0, [("GD", True), ("GA", False), ("Date", True)]),
+    ("tight", lambda d: (abs(d["GD"]) <= 1) & (d["Points"] >= 1), [("Date", False)]),
+]
+
 
 def movement_sentence(delta: float) -> str:
     if delta >= 10:
@@ -17,52 +31,115 @@ def movement_sentence(delta: float) -> str:
     return "The overall points swing was modest."
 
 
+def _strong(text: str, markdown: bool) -> str:
+    return f"**{text}**" if markdown else text
+
+
+def swing_sentence(
+        team: str,
+        xdelta: float,
+        swing_pct: float,
+        markdown: bool = False
+) -> str:
+    return (
+        f"Simulating both seasons from {team}'s goal and shot-on-target rates gives an "
+        f"expected swing of {_strong(f'{xdelta:+.1f}', markdown)}; the real swing matched "
+        f"or beat {_strong(f'{swing_pct:.0%}', markdown)} of simulated seasons."
+    )
+
+
+def pace_sentence(
+        team: str,
+        gap: np.ndarray,
+        prev_season: str,
+        markdown: bool = False
+) -> str | None:
+    # gap is PointsTrajectory.delta_trajectory; None when it does not reach
+    # the end of the season
+    if not len(gap) or np.isnan(gap[-1]):
+        return None
+    halfway = len(gap) // 2
+    return (
+        f"After {halfway} matchdays {team} were {_strong(f'{gap[halfway]:+.0f}', markdown)} "
+        f"points on their {prev_season} pace, finishing {_strong(f'{gap[-1]:+.0f}', markdown)}."
+    )
+
+
+def _top_position(
+        arrays: dict[str, np.ndarray],
+        mask: np.ndarray,
+        keys: list[tuple[str, bool]]
+) -> int | None:
+    # lexicographic arg-best by narrowing the candidates key by key: O(rows)
+    pos = np.flatnonzero(mask)
+    for col, ascending in keys:
+        if len(pos) <= 1:
+            break
+        values = arrays[col][pos]
+        pos = pos[values == (values.min() if ascending else values.max())]
+    return int(pos[0]) if len(pos) else None
+
+
+def _callout_line(row: dict, team: str) -> str:
+    venue = row["Venue"]
+    opponent = row["Opponent"]
+    fixture = f"vs {opponent}" if venue == "Home" else f"at {opponent}"
+    if row["Points"] == 3:
+        reason = "a high-value win"
+    elif row["Points"] == 1:
+        reason = "a tight point"
+    else:
+        reason = "a costly loss"
+    date_str = pd.Timestamp(row["Date"]).strftime("%Y-%m-%d")
+    return (
+        f"{date_str}: {team} {int(row['GF'])}-{int(row['GA'])} {fixture} "
+        f"({venue}) was {reason}."
+    )
+
+
+@instrumented()
 def match_callouts(df: pd.DataFrame, team: str) -> list[str]:
     if df.empty:
         return []
 
-    data = df.copy()
-    data["abs_gd"] = data["GD"].abs()
+    arrays = {col: df[col].to_numpy() for col in CALLOUT_COLUMNS}
+    picked: list[int] = []
+    for _, bucket, keys in CALLOUT_BUCKETS:
+        mask = np.array(bucket(arrays), dtype=bool)
+        mask[picked] = False
+        pos = _top_position(arrays, mask, keys)
+        if pos is not None:
+            picked.append(pos)
+
+    if not picked:
+        picked = np.lexsort((arrays["Date"], -np.abs(arrays["GD"])))[:3]
 
-    candidates = []
-    buckets = [
-        data.loc[data["Points"] == 3].sort_values(["GD", "GF", "Date"], ascending=[False, False, True]),
-        data.loc[data["Points"] == 0].sort_values(["GD", "GA", "Date"], ascending=[True, False, True]),
-        data.loc[(data["GD"].abs() <= 1) & (data["Points"] >= 1)].sort_values("Date", ascending=False),
+    return [
+        _callout_line({col: values[pos] for col, values in arrays.items()}, team)
+        for pos in picked
     ]
 
-    seen = set()
-    for bucket in buckets:
-        for _, row in bucket.iterrows():
-            if row["match_id"] in seen:
-                continue
-            candidates.append(row.to_dict())
-            seen.add(row["match_id"])
-            break
 
-    if not candidates:
-        candidates = (
-            data.sort_values(["abs_gd", "Date"], ascending=[False, True])
-            .head(3)
-            .to_dict("records")
+def match_callouts_by_team(team_matches: pd.DataFrame) -> dict[str, list[str]]:
+    # every team's default callouts from one sort per bucket
+    if team_matches.empty:
+        return {}
+
+    data = team_matches.reset_index(drop=True)
+    picked = pd.Series(False, index=data.index)
+    picks = []
+    for rank, (_, bucket, keys) in enumerate(CALLOUT_BUCKETS):
+        cols, ascending = zip(*keys)
+        top = (
+            data.loc[bucket(data) & ~picked]
+            .sort_values(["Team", *cols], ascending=[True, *ascending], kind="stable")
+            .drop_duplicates("Team")
         )
+        picked[top.index] = True
+        picks.append(top.assign(_rank=rank))
 
-    lines = []
-    for row in candidates[:3]:
-        date_str = row["Date"].strftime("%Y-%m-%d")
-        venue = row["Venue"]
-        opponent = row["Opponent"]
-        gf = int(row["GF"])
-        ga = int(row["GA"])
-        points = int(row["Points"])
-
-        fixture = f"vs {opponent}" if venue == "Home" else f"at {opponent}"
-        if points == 3:
-            reason = "a high-value win"
-        elif points == 1:
-            reason = "a tight point"
-        else:
-            reason = "a costly loss"
-        lines.append(f"{date_str}: {team} {gf}-{ga} {fixture} ({venue}) was {reason}.")
-
-    return lines
+    rows = pd.concat(picks).sort_values(["Team", "_rank"], kind="stable")
+    callouts = {str(team): [] for team in data["Team"].unique()}
+    for row in rows[["Team", *CALLOUT_COLUMNS]].to_dict("records"):
+        callouts[str(row["Team"])].append(_callout_line(row, str(row["Team"])))
+    return callouts
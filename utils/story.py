@@ -0,0 +1,156 @@
+"""
+Per-team story payloads, precomputed in parallel so the app only looks up and renders
+
+    python -m utils.story            # writes .cache/stories/<dataset version>.json
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from src.cache import load_cached_datasets
+from src.constants import DEFAULT_LEAGUE
+from src.data import Datasets
+
+from .deltas import home_away_delta, team_delta
+from .nums_to_words import match_callouts, movement_sentence
+
+STORY_DIR = Path(__file__).resolve().parents[1] / ".cache" / "stories"
+
+DETAIL_COLUMNS = ["Date", "season", "Venue", "Opponent", "GF", "GA", "Points", "Referee"]
+DETAIL_ROWS = 20
+
+# bump whenever the story payload changes shape; older files are ignored
+STORY_FORMAT = 2
+
+# the scatter's brush range when nothing is selected
+DEFAULT_RANGE = (0.0, 20.0)
+
+
+def brushed_matches(
+        team_matches: pd.DataFrame,
+        gf_range: tuple[float, float] = DEFAULT_RANGE,
+        ga_range: tuple[float, float] = DEFAULT_RANGE
+) -> pd.DataFrame:
+    return team_matches.loc[
+        team_matches["GF"].between(*gf_range) & team_matches["GA"].between(*ga_range)
+    ]
+
+
+def match_details(matches: pd.DataFrame, limit: int = DETAIL_ROWS) -> pd.DataFrame:
+    details = matches.sort_values("Date", ascending=True).head(limit)[DETAIL_COLUMNS]
+    return details.assign(Date=details["Date"].dt.strftime("%Y-%m-%d"))
+
+
+def team_story(datasets: Datasets, team: str) -> dict:
+    index = datasets.team_index
+    p_prev, p_curr, p_delta = team_delta(datasets, team)
+    matches = brushed_matches(index["team_matches"].rows(team))
+    details = match_details(matches)
+
+    return {
+        "team": team,
+        "points": {"prev": p_prev, "curr": p_curr, "delta": p_delta},
+        "movement": movement_sentence(p_delta),
+        "home_away": home_away_delta(datasets, team),
+        "callouts": match_callouts(matches, team),
+        "matches": details.to_dict("records"),
+    }
+
+
+_WORKER_DATASETS: Datasets | None = None
+
+
+def _init_worker(data_dir: Path | None, league: str | None) -> None:
+    # each worker maps the prebuilt cache entry instead of re-deriving
+    global _WORKER_DATASETS
+    _WORKER_DATASETS = load_cached_datasets(data_dir, league)
+
+
+def _run_chunk(fn: Callable[[Datasets, str], object], teams: list[str]) -> list:
+    return [fn(_WORKER_DATASETS, team) for team in teams]
+
+
+def map_teams(
+        fn: Callable[[Datasets, str], object],
+        teams: list[str],
+        data_dir: Path | None = None,
+        league: str | None = DEFAULT_LEAGUE,
+        workers: int | None = None
+) -> list:
+    # fn(datasets, team) for every team, in order, over a process pool with
+    # one contiguous chunk of teams per worker; fn must be picklable (a
+    # module-level function or a partial of one). Load the datasets once
+    # before calling so the workers find the cache entry.
+    workers = workers or os.cpu_count() or 1
+    chunks = [c.tolist() for c in np.array_split(np.asarray(teams, dtype=object), workers) if len(c)]
+    with ProcessPoolExecutor(
+        max_workers=len(chunks),
+        initializer=_init_worker,
+        initargs=(data_dir, league),
+    ) as pool:
+        return [out for batch in pool.map(partial(_run_chunk, fn), chunks) for out in batch]
+
+
+def build_stories(
+        data_dir: Path | None = None,
+        league: str | None = DEFAULT_LEAGUE,
+        workers: int | None = None
+) -> tuple[str, dict[str, dict]]:
+    datasets = load_cached_datasets(data_dir, league)  # also warms the cache for workers
+    teams = datasets.team_index["team_summary"].teams
+    stories = map_teams(team_story, teams, data_dir, league, workers)
+    return datasets.version, {s["team"]: s for s in stories}
+
+
+def story_path(version: str, story_dir: Path | None = None) -> Path:
+    return Path(story_dir or STORY_DIR) / f"{version}.json"
+
+
+def save_stories(
+        version: str,
+        stories: dict[str, dict],
+        story_dir: Path | None = None
+) -> Path:
+    path = story_path(version, story_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    payload = {"format": STORY_FORMAT, "version": version, "stories": stories}
+    tmp.write_text(json.dumps(payload, separators=(",", ":")))
+    os.replace(tmp, path)
+    return path
+
+
+def load_stories(version: str, story_dir: Path | None = None) -> dict[str, dict] | None:
+    path = story_path(version, story_dir)
+    try:
+        payload = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    if payload.get("version") != version or payload.get("format") != STORY_FORMAT:
+        return None
+    return payload["stories"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precompute every team's story payload")
+    parser.add_argument("--data-dir", type=Path)
+    parser.add_argument("--league", default=DEFAULT_LEAGUE)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--out-dir", type=Path, help=f"default: {STORY_DIR}")
+    args = parser.parse_args()
+
+    version, stories = build_stories(args.data_dir, args.league, args.workers)
+    path = save_stories(version, stories, args.out_dir)
+    print(f"wrote {len(stories)} team stories to {path}")
+
+
+if __name__ == "__main__":
+    main()